@@ -8,11 +8,8 @@ import argparse
 import os
 import sys
 
-# Add src directory to path to import our modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
-
-from email_processor import EmailProcessor  # noqa: E402
-from pst_processor import PSTProcessor  # noqa: E402
+from src.email_processor import EmailProcessor
+from src.pst_processor import PSTProcessor
 
 
 def main():
@@ -28,12 +25,43 @@ def main():
     - --format/-f: Output format ('eml', 'pdf', 'both', default: 'eml')
     - --verbose/-v: Enable verbose output
     - --dry-run: Preview mode without saving files
+    - --workers/-j: Number of worker processes (default: number of CPUs)
     - --interactive: Force interactive mode
 
     Exit codes:
     - 0: Success
     - 1: Error or user cancellation
     """
+    args = _build_parser().parse_args()
+
+    # If no input is provided or interactive flag is set, run interactive mode
+    if not args.input or args.interactive:
+        interactive_args = _interactive_mode()
+        if interactive_args is None:
+            sys.exit(1)
+        success = _process_emails(interactive_args)
+    else:
+        # Command line mode
+        cli_args = {
+            "input": args.input,
+            "output": args.output,
+            "format": args.format,
+            "verbose": args.verbose,
+            "dry_run": args.dry_run,
+            "workers": args.workers,
+        }
+        success = _process_emails(cli_args)
+
+    sys.exit(0 if success else 1)
+
+
+def _build_parser():
+    """
+    Build the command line argument parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser for the options documented in main().
+    """
     parser = argparse.ArgumentParser(
         description="Extract and convert emails from PST/OST files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -74,30 +102,42 @@ Examples:
         help="Show what would be processed without actually saving files",
     )
 
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=_positive_int,
+        default=None,
+        help="Number of worker processes used to export emails "
+        "(default: number of CPUs)",
+    )
+
     parser.add_argument(
         "--interactive", action="store_true", help="Run in interactive mode"
     )
 
-    args = parser.parse_args()
+    return parser
 
-    # If no input is provided or interactive flag is set, run interactive mode
-    if not args.input or args.interactive:
-        interactive_args = _interactive_mode()
-        if interactive_args is None:
-            sys.exit(1)
-        success = _process_emails(interactive_args)
-    else:
-        # Command line mode
-        cli_args = {
-            "input": args.input,
-            "output": args.output,
-            "format": args.format,
-            "verbose": args.verbose,
-            "dry_run": args.dry_run,
-        }
-        success = _process_emails(cli_args)
 
-    sys.exit(0 if success else 1)
+def _positive_int(value):
+    """
+    Parse a command line value that must be a whole number of at least 1.
+
+    Args:
+        value (str): The value given on the command line.
+
+    Returns:
+        int: The parsed number.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer >= 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a whole number >= 1, got {value!r}")
+    return number
 
 
 def _interactive_mode():
@@ -228,6 +268,7 @@ def _process_emails(args):
                     - 'format': Output format ('eml', 'pdf', or 'both')
                     - 'verbose': Boolean for verbose output
                     - 'dry_run': Boolean for dry run mode (optional)
+                    - 'workers': Number of worker processes (optional)
 
     Returns:
         bool: True if processing was successful, False if errors occurred.
@@ -241,6 +282,7 @@ def _process_emails(args):
         output_format=args["format"],
         verbose=args.get("verbose", False),
         dry_run=args.get("dry_run", False),
+        workers=args.get("workers"),
     )
 
 
@@ -0,0 +1,3 @@
+"""
+Core modules of the PST/OST Email Exporter.
+"""
@@ -1,17 +1,100 @@
-import email as py_email
+import collections
+import concurrent.futures
+import contextlib
+import io
+import itertools
 import os
 import re
+import sys
 import traceback
 from datetime import datetime
-from email import policy
+from html.parser import HTMLParser
 from pathlib import Path
 
 import pypff
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
-from file_saver import FileSaver
-from pst_processor import PSTProcessor
+from .file_saver import (
+    _HEADER_PARSER,
+    _INVALID_FILENAME_CHARS,
+    _INVALID_FILENAME_RE,
+    FileSaver,
+    address_headers,
+    write_replacing,
+)
+from .pst_processor import PSTProcessor
+
+# UTF-8 encodings of "ç", "ã", "á", "é", "í", "ó" and "ú"
+_UTF8_SIGILS = tuple(char.encode("utf-8") for char in "çãáéíóú")
+
+# "ç", "ã" and "á" encoded as UTF-8 twice, which decodes to "Ã§", "Ã£", "Ã¡"
+_DOUBLE_ENCODED_SIGILS = tuple(
+    char.encode("utf-8").decode("latin-1").encode("utf-8") for char in "çãá"
+)
+
+# Line boundaries recognized by str.splitlines()
+_LINE_BREAK = re.compile("\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# HTML elements whose content is never shown, and elements that start a new
+# line, when an HTML body is converted to text for the PDF output
+_HIDDEN_HTML_TAGS = frozenset({"script", "style", "title"})
+_BLOCK_HTML_TAGS = frozenset(
+    {
+        "blockquote",
+        "br",
+        "div",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "table",
+        "tr",
+        "ul",
+    }
+)
+# Table cells, separated by a space so adjacent cells do not run together
+_CELL_HTML_TAGS = frozenset({"td", "th"})
+
+# Number of emails sent to an export worker per task
+EXPORT_CHUNK_SIZE = 64
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows
+MAX_WINDOWS_WORKERS = 61
+
+# Per-process state for export pool workers, populated by _init_worker()
+_worker_state = {}
+
+# Output-ready parts of an email, as returned by EmailProcessor._prepare_email()
+PreparedEmail = collections.namedtuple(
+    "PreparedEmail", ["file_stem", "recipient_list", "to_field", "body"]
+)
+
+# Properties of an email read once, as returned by
+# EmailProcessor._snapshot_email()
+EmailSnapshot = collections.namedtuple(
+    "EmailSnapshot",
+    [
+        "subject",
+        "sender_name",
+        "sender_email_address",
+        "transport_headers",
+        "display_to",
+        "delivery_time",
+        "creation_time",
+        "body",
+        "body_is_html",
+    ],
+)
+
+# Header-only view of an email, as yielded by EmailProcessor.iter_email_headers()
+EmailHeaders = collections.namedtuple(
+    "EmailHeaders", ["folder_path", "subject", "delivery_time", "creation_time"]
+)
 
 
 class EmailProcessor:
@@ -21,15 +104,18 @@ class EmailProcessor:
 
     This class provides methods to:
     - Load emails from a PST file using the pypff library.
+    - Stream emails one at a time to keep memory use constant on large files.
     - Recursively extract messages from folders and subfolders within the PST file.
     - Format email delivery or creation times for use in filenames.
     - Save extracted emails as .eml files with sanitized filenames.
     - Export emails as PDF files using the reportlab library, including headers
       and message body.
+    - Save both formats at once, sharing header parsing and body decoding.
 
     Attributes:
         file_path (str): Path to the PST file to be processed.
         emails (list): List of extracted email data dictionaries.
+        _today (str): Current date as [YYYY-MM-DD], used for undated emails.
 
     Typical usage:
         processor = EmailProcessor("/path/to/file.pst")
@@ -43,12 +129,15 @@ class EmailProcessor:
         Initialize the EmailProcessor with the path to a PST/OST file.
 
         Args:
-            file_path (str): The file path to the PST/OST file to be processed.
+            file_path (str or os.PathLike): The file path to the PST/OST file to
+                be processed.
         """
-        self.file_path = file_path
+        # Normalize once; pypff and the worker processes need a plain string
+        self.file_path = os.fspath(file_path)
+        self._today = f"[{datetime.now():%Y-%m-%d}]"
         self.emails = []
 
-    def extract_messages(self, folder, folder_path=""):
+    def extract_messages(self, folder, folder_path="", folder_indices=()):
         """
         Recursively extract messages from the given folder and its subfolders.
 
@@ -56,17 +145,17 @@ class EmailProcessor:
             folder: The pypff folder object to extract messages from.
             folder_path (str, optional): The current folder path for maintaining
                 hierarchy. Defaults to "".
+            folder_indices (tuple, optional): Sub-folder indices leading from the
+                root folder to this folder. Defaults to ().
+
+        Note:
+            Each email carries a 'location' key of (folder_indices, message_index)
+            so the message can be located again after reopening the PST file,
+            since pypff message handles cannot be passed between processes.
         """
-        for i in range(folder.number_of_sub_messages):
-            message = folder.get_sub_message(i)
-            email_data = {"message": message, "folder_path": folder_path}
-            self.emails.append(email_data)
-        for j in range(folder.number_of_sub_folders):
-            sub_folder = folder.get_sub_folder(j)
-            sub_folder_name = sub_folder.name or "Unnamed Folder"
-            self.extract_messages(
-                sub_folder, os.path.join(folder_path, sub_folder_name)
-            )
+        self.emails.extend(
+            self._iter_folder_emails(folder, folder_path, folder_indices)
+        )
 
     def load_emails(self):
         """
@@ -75,6 +164,10 @@ class EmailProcessor:
         Returns:
             list: A list of dictionaries containing email data with 'message'
                 and 'folder_path' keys.
+
+        Note:
+            This keeps every message handle in memory at once; prefer
+            iter_emails() when the emails only need to be visited once.
         """
         pst_file = pypff.file()
         pst_file.open(self.file_path)
@@ -85,8 +178,150 @@ class EmailProcessor:
 
         return self.emails
 
+    def iter_emails(self):
+        """
+        Lazily yield emails from the PST file while walking its folder tree.
+
+        Only one message handle is held at a time, so memory use stays
+        constant regardless of mailbox size.
+
+        Yields:
+            dict: Email data with 'message', 'folder_path' and 'location' keys.
+        """
+        with self._open_root_folder() as root_folder:
+            yield from self._iter_folder_emails(root_folder)
+
+    def iter_email_refs(self):
+        """
+        Lazily yield lightweight, picklable references to every email.
+
+        Unlike iter_emails(), no message is opened; each reference can be
+        resolved again after reopening the PST file in another process.
+
+        Yields:
+            dict: Email references with 'folder_path' and 'location' keys.
+        """
+        with self._open_root_folder() as root_folder:
+            for folder, folder_path, folder_indices in self._walk_folders(root_folder):
+                for i in range(folder.number_of_sub_messages):
+                    yield {"folder_path": folder_path, "location": (folder_indices, i)}
+
+    def iter_email_headers(self):
+        """
+        Lazily yield only the header fields needed to name each email's files.
+
+        Bodies, transport headers and attachments are never read, which makes
+        this much cheaper than iter_emails() for previews such as dry runs.
+
+        Yields:
+            EmailHeaders: The folder path, subject, delivery time and creation
+                time of each email.
+        """
+        with self._open_root_folder() as root_folder:
+            for folder, folder_path, _ in self._walk_folders(root_folder):
+                for i in range(folder.number_of_sub_messages):
+                    message = folder.get_sub_message(i)
+                    yield EmailHeaders(
+                        folder_path,
+                        message.subject,
+                        getattr(message, "delivery_time", None),
+                        getattr(message, "creation_time", None),
+                    )
+
+    def count_emails(self):
+        """
+        Count the emails in the PST file without opening any message.
+
+        Returns:
+            int: Total number of messages across all folders.
+        """
+        with self._open_root_folder() as root_folder:
+            return sum(
+                folder.number_of_sub_messages
+                for folder, _, _ in self._walk_folders(root_folder)
+            )
+
+    @contextlib.contextmanager
+    def _open_root_folder(self):
+        """
+        Open the PST file for the duration of a with-block.
+
+        Yields:
+            The pypff root folder object of the PST file.
+        """
+        pst_file = pypff.file()
+        pst_file.open(self.file_path)
+        try:
+            yield pst_file.get_root_folder()
+        finally:
+            pst_file.close()
+
+    def _walk_folders(self, folder, folder_path="", folder_indices=()):
+        """
+        Walk a folder tree depth-first, parents before their subfolders.
+
+        Args:
+            folder: The pypff folder object to start from.
+            folder_path (str, optional): The path of the starting folder.
+                Defaults to "".
+            folder_indices (tuple, optional): Sub-folder indices leading from the
+                root folder to the starting folder. Defaults to ().
+
+        Yields:
+            tuple: (folder, folder_path, folder_indices) for every folder.
+        """
+        # Explicit stack instead of recursion: deep hierarchies cannot hit
+        # the recursion limit and yields are not relayed through one
+        # generator frame per level
+        stack = [(folder, folder_path, folder_indices)]
+        while stack:
+            folder, folder_path, folder_indices = stack.pop()
+            yield folder, folder_path, folder_indices
+
+            get_sub_folder = folder.get_sub_folder
+            # Subfolder paths are built by plain concatenation rather than
+            # os.path.join(); the prefix is the same for every subfolder
+            prefix = f"{folder_path}{os.sep}" if folder_path else ""
+            sub_folders = []
+            for j in range(folder.number_of_sub_folders):
+                sub_folder = get_sub_folder(j)
+                sub_folder_name = sub_folder.name or "Unnamed Folder"
+                sub_folders.append(
+                    (sub_folder, prefix + sub_folder_name, folder_indices + (j,))
+                )
+            # Reversed so the first subfolder is popped (and walked) first
+            stack.extend(reversed(sub_folders))
+
+    def _iter_folder_emails(self, folder, folder_path="", folder_indices=()):
+        """
+        Yield email data for every message in a folder and its subfolders.
+
+        Args:
+            folder: The pypff folder object to extract messages from.
+            folder_path (str, optional): The path of the folder. Defaults to "".
+            folder_indices (tuple, optional): Sub-folder indices leading from the
+                root folder to the folder. Defaults to ().
+
+        Yields:
+            dict: Email data with 'message', 'folder_path' and 'location' keys.
+        """
+        for sub_folder, sub_folder_path, sub_folder_indices in self._walk_folders(
+            folder, folder_path, folder_indices
+        ):
+            for i in range(sub_folder.number_of_sub_messages):
+                yield {
+                    "message": sub_folder.get_sub_message(i),
+                    "folder_path": sub_folder_path,
+                    "location": (sub_folder_indices, i),
+                }
+
     def process_emails(
-        self, output_dir, output_format="eml", verbose=False, dry_run=False
+        self,
+        output_dir,
+        output_format="eml",
+        verbose=False,
+        dry_run=False,
+        workers=None,
     ):
         """
         Process emails with the given arguments and extract them to the
@@ -97,6 +332,9 @@ class EmailProcessor:
             output_format (str): Output format ('eml', 'pdf', or 'both')
             verbose (bool): Enable verbose output
             dry_run (bool): Preview mode without saving files
+            workers (int, optional): Number of worker processes used to export
+                emails. Defaults to the number of CPUs; 1 exports serially in
+                the current process. Capped at MAX_WINDOWS_WORKERS on Windows.
 
         Returns:
             bool: True if processing was successful, False if errors occurred.
@@ -104,7 +342,7 @@ class EmailProcessor:
         This method performs the core email extraction workflow:
         - Validates the input PST/OST file
         - Creates the output directory structure
-        - Loads and processes all emails from the PST file
+        - Streams and processes all emails from the PST file
         - Saves emails in the requested format(s)
         - Extracts and saves attachments
         - Provides progress feedback and error handling
@@ -129,92 +367,65 @@ class EmailProcessor:
         print("-" * 50)
 
         try:
-            # Load emails
-            emails = self.load_emails()
+            # Count emails up front; they are streamed one at a time below
+            total = self.count_emails()
 
-            print(f"✅ Found {len(emails)} emails to process")
+            print(f"✅ Found {total} emails to process")
 
             if dry_run:
                 print("\n📋 DRY RUN - Files that would be created:")
-                for i, email_data in enumerate(emails[:10]):  # Show first 10 as preview
-                    email = email_data["message"]
-                    folder_path = email_data["folder_path"]
-
-                    # Format delivery time for filename
-                    date_prefix = self._format_delivery_time(email)
-                    subject = email.subject or "no_subject"
-                    clean_subject = subject[:50].strip()
-
-                    if output_format in ["eml", "both"]:
-                        print(f"  📧 {folder_path}/{date_prefix} - {clean_subject}.eml")
-                    if output_format in ["pdf", "both"]:
-                        print(f"  📄 {folder_path}/{date_prefix} - {clean_subject}.pdf")
-
-                if len(emails) > 10:
-                    print(f"  ... and {len(emails) - 10} more emails")
+                want_eml = output_format in {"eml", "both"}
+                want_pdf = output_format in {"pdf", "both"}
+                # Show first 10 as preview, reading headers only
+                for headers in itertools.islice(self.iter_email_headers(), 10):
+                    folder_path = headers.folder_path
+                    # Same sanitized name the real export would use
+                    file_stem = self._file_stem(headers)
+
+                    if want_eml:
+                        print(f"  📧 {folder_path}/{file_stem}.eml")
+                    if want_pdf:
+                        print(f"  📄 {folder_path}/{file_stem}.pdf")
+
+                if total > 10:
+                    print(f"  ... and {total - 10} more emails")
                 return True
 
-            # Initialize file saver
-            file_saver = FileSaver(output_dir)
+            if workers is None:
+                workers = os.cpu_count() or 1
+            if os.name == "nt":
+                workers = min(workers, MAX_WINDOWS_WORKERS)
 
-            # Process each email
+            # Export each email, serially or across a pool of worker processes.
+            # Log lines are buffered and written in batches to keep terminal
+            # I/O out of the export loop.
             processed = 0
-            for email_data in emails:
-                email = email_data["message"]
-                folder_path = email_data["folder_path"]
+            log_buffer = []
+            progress_shown = False
+            exports = self._iter_exports(output_dir, output_format, verbose, workers)
+            for handled, (exported, log_lines) in enumerate(exports, 1):
+                log_buffer.extend(log_lines)
+                if handled % 100 == 0 and log_buffer:
+                    _flush_log(log_buffer, progress_shown)
+                    progress_shown = False
+                if not exported:
+                    continue
+                processed += 1
 
-                try:
-                    # Create folder structure using FileSaver
-                    full_folder_path = file_saver._create_full_path(folder_path)
+                # Progress indicator, rewritten in place instead of scrolling
+                if not verbose and processed % 50 == 0:
+                    sys.stdout.write(f"\r📧 Processed {processed}/{total} emails...")
+                    sys.stdout.flush()
+                    progress_shown = True
 
-                    # Save email in requested format(s)
-                    if output_format in ["eml", "both"]:
-                        self.save_as_eml(email, full_folder_path)
-                        if verbose:
-                            subject = email.subject or "No Subject"
-                            print(f"✅ Saved EML: {folder_path}/{subject}")
+            _flush_log(log_buffer, progress_shown)
 
-                    if output_format in ["pdf", "both"]:
-                        self.save_as_pdf(email, full_folder_path)
-                        if verbose:
-                            subject = email.subject or "No Subject"
-                            print(f"✅ Saved PDF: {folder_path}/{subject}")
-
-                    # Save attachments if any
-                    try:
-                        num_attachments = email.number_of_attachments
-                        if num_attachments and num_attachments > 0:
-                            attachments_folder = os.path.join(
-                                full_folder_path, "attachments"
-                            )
-                            os.makedirs(attachments_folder, exist_ok=True)
-
-                            for i in range(num_attachments):
-                                try:
-                                    attachment = email.get_attachment(i)
-                                    file_saver.save_attachment(
-                                        attachment, attachments_folder
-                                    )
-                                    if verbose:
-                                        print(f"📎 Saved attachment: {attachment.name}")
-                                except Exception as e:
-                                    print(f"⚠️  Error saving attachment {i}: {e}")
-                    except Exception:
-                        # Silently assume no attachments if access fails
-                        pass
-
-                    processed += 1
-
-                    # Progress indicator
-                    if not verbose and processed % 50 == 0:
-                        print(f"📧 Processed {processed}/{len(emails)} emails...")
-
-                except Exception as e:
-                    subject = email.subject or "No Subject"
-                    print(f"❌ Error processing email '{subject}': {e}")
-                    continue
+            # Files are never fsynced individually; flush everything to disk
+            # once at the end instead (os.sync is not available on Windows)
+            if hasattr(os, "sync"):
+                os.sync()
 
-            print(f"\n🎉 Successfully processed {processed}/{len(emails)} emails!")
+            print(f"\n🎉 Successfully processed {processed}/{total} emails!")
             print(f"📂 Files saved to: {output_dir}")
             return True
 
@@ -224,92 +435,425 @@ class EmailProcessor:
                 traceback.print_exc()
             return False
 
-    def save_as_eml(self, email, output_path):
+    def _iter_exports(self, output_dir, output_format, verbose, workers):
+        """
+        Stream emails from the PST file, export them and yield whether each one
+        was saved successfully.
+
+        Args:
+            output_dir (str): Output directory for extracted emails.
+            output_format (str): Output format ('eml', 'pdf', or 'both').
+            verbose (bool): Enable verbose output.
+            workers (int): Number of worker processes. With more than one
+                worker, chunks of emails are exported in parallel by a process
+                pool; results are still yielded in mailbox order.
+
+        Yields:
+            tuple: (exported, log_lines) for each email, where exported is True
+                if the email was saved and log_lines lists its progress and
+                error messages.
+        """
+        if workers <= 1:
+            # Files are written by a background thread while the next emails
+            # are read and rendered; each chunk waits for its writes so write
+            # errors are reported with the email they belong to
+            file_saver = FileSaver(output_dir, background_writes=True)
+            try:
+                for chunk in _chunked(self.iter_emails(), EXPORT_CHUNK_SIZE):
+                    results = []
+                    for email_data in chunk:
+                        file_saver.write_tag = len(results)
+                        log = []
+                        exported = self._export_email(
+                            email_data, file_saver, output_format, verbose, log
+                        )
+                        results.append((exported, log))
+                    _flush_writes(file_saver, results)
+                    yield from results
+            finally:
+                file_saver.close()
+            return
+
+        # pypff handles cannot be pickled, so workers reopen the PST file once
+        # in their initializer and look each message up again by its location.
+        # Emails are sent in chunks to amortize task overhead, and only a few
+        # chunks per worker are in flight so the PST is still streamed.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.file_path, output_dir),
+        ) as executor:
+            pending = collections.deque()
+            for chunk in _chunked(self.iter_email_refs(), EXPORT_CHUNK_SIZE):
+                pending.append(
+                    executor.submit(_export_chunk, chunk, output_format, verbose)
+                )
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _export_email(self, email_data, file_saver, output_format, verbose, log):
+        """
+        Save a single email and its attachments in the requested format(s).
+
+        Args:
+            email_data (dict): Email data with 'message' and 'folder_path' keys.
+            file_saver (FileSaver): FileSaver rooted at the output directory.
+            output_format (str): Output format ('eml', 'pdf', or 'both').
+            verbose (bool): Enable verbose output.
+            log (list): List that progress and error messages are appended to
+                instead of being printed directly.
+
+        Returns:
+            bool: True if the email was saved, False if an error occurred.
+        """
+        message = email_data["message"]
+        folder_path = email_data["folder_path"]
+        subject = "No Subject"
+
+        try:
+            # Read the message's properties once for both savers and all log
+            # and error messages below
+            email = self._snapshot_email(message)
+            subject = email.subject or subject
+
+            # Create folder structure using FileSaver
+            full_folder_path = file_saver._create_full_path(folder_path)
+
+            # Save email in requested format(s); "both" prepares the shared
+            # parts of the two outputs only once
+            if output_format == "both":
+                self.save_both(email, full_folder_path, file_saver)
+            elif output_format == "eml":
+                self.save_as_eml(email, full_folder_path, file_saver)
+            else:
+                self.save_as_pdf(email, full_folder_path, file_saver)
+
+            if verbose:
+                if output_format in {"eml", "both"}:
+                    log.append(f"✅ Saved EML: {folder_path}/{subject}")
+                if output_format in {"pdf", "both"}:
+                    log.append(f"✅ Saved PDF: {folder_path}/{subject}")
+
+            # Save attachments if any; the count is read once and the common
+            # attachment-free case skips the block entirely
+            num_attachments = message.number_of_attachments or 0
+            if num_attachments:
+                attachments_folder = file_saver._create_attachments_path(
+                    full_folder_path
+                )
+
+                for i in range(num_attachments):
+                    try:
+                        attachment = message.get_attachment(i)
+                        file_saver.save_attachment(attachment, attachments_folder)
+                        if verbose:
+                            log.append(f"📎 Saved attachment: {attachment.name}")
+                    except Exception as e:
+                        log.append(f"⚠️  Error saving attachment {i}: {e}")
+
+            return True
+
+        except Exception as e:
+            log.append(f"❌ Error processing email '{subject}': {e}")
+            return False
+
+    def save_as_eml(self, email, output_path, file_saver=None):
         """
         Save the email as an .eml file with sanitized filename including date prefix.
 
         Args:
             email: The pypff email object to save.
             output_path (str): The directory path where the .eml file will be saved.
+            file_saver (FileSaver, optional): FileSaver that writes the output,
+                possibly in the background (see FileSaver.write_file()).
+        """
+        email = self._snapshot_email(email)
+        prepared = self._prepare_email(email)
+        self._save_eml(email, prepared, output_path, file_saver)
+
+    def save_as_pdf(self, email, output_path, file_saver=None):
+        """
+        Save the email as a .pdf file using reportlab with headers and body content.
+
+        Args:
+            email: The pypff email object to save.
+            output_path (str): The directory path where the .pdf file will be saved.
+            file_saver (FileSaver, optional): FileSaver that writes the output,
+                possibly in the background (see FileSaver.write_file()).
+        """
+        email = self._snapshot_email(email)
+        prepared = self._prepare_email(email)
+        self._save_pdf(email, prepared, output_path, file_saver)
+
+    def save_both(self, email, output_path, file_saver=None):
+        """
+        Save the email as both an .eml and a .pdf file.
+
+        The filename, recipients and decoded body are prepared once and shared
+        by both outputs, instead of being recomputed by save_as_eml() and
+        save_as_pdf() separately.
+
+        Args:
+            email: The pypff email object to save.
+            output_path (str): The directory path where both files will be saved.
+            file_saver (FileSaver, optional): FileSaver that writes the output,
+                possibly in the background (see FileSaver.write_file()).
+        """
+        email = self._snapshot_email(email)
+        prepared = self._prepare_email(email)
+        self._save_eml(email, prepared, output_path, file_saver)
+        self._save_pdf(email, prepared, output_path, file_saver)
+
+    def _snapshot_email(self, email):
+        """
+        Read the properties the savers use from an email object, once.
+
+        Each property access on a pypff message calls into libpff, and the
+        savers read some of them several times (the subject up to four times
+        in "both" mode).
+
+        Args:
+            email: The pypff email object, or an existing EmailSnapshot.
+
+        Returns:
+            EmailSnapshot: The email's properties. Missing ones are None, and
+                body is the plain text body, falling back to the HTML body
+                (body_is_html is then True).
+        """
+        if isinstance(email, EmailSnapshot):
+            return email
+        plain_text_body = getattr(email, "plain_text_body", None)
+        body = plain_text_body or getattr(email, "html_body", None)
+        return EmailSnapshot(
+            subject=getattr(email, "subject", None),
+            sender_name=getattr(email, "sender_name", None),
+            sender_email_address=getattr(email, "sender_email_address", None),
+            transport_headers=getattr(email, "transport_headers", None),
+            display_to=getattr(email, "display_to", None),
+            delivery_time=getattr(email, "delivery_time", None),
+            creation_time=getattr(email, "creation_time", None),
+            body=body,
+            body_is_html=bool(body) and not plain_text_body,
+        )
+
+    def _prepare_email(self, email):
+        """
+        Compute everything the .eml and .pdf writers need from an email.
+
+        Args:
+            email (EmailSnapshot): Snapshot of the pypff email object.
+
+        Returns:
+            PreparedEmail: The filename stem, recipients and decoded body.
+        """
+        recipient_list, to_field = self._extract_recipients(email)
+        return PreparedEmail(
+            file_stem=self._file_stem(email),
+            recipient_list=recipient_list,
+            to_field=to_field,
+            body=self._decode_body(email.body or ""),
+        )
+
+    def _write_pdf_prepared(self, pdf_file, email, prepared):
+        """
+        Render a prepared email as a PDF document.
+
+        Args:
+            pdf_file: The binary file object to write to.
+            email: The pypff email object being saved.
+            prepared (PreparedEmail): The email's prepared content.
+
+        Note:
+            HTML-only bodies are reduced to their text first, so the PDF shows
+            the message rather than its markup. The .eml output keeps the
+            original HTML.
+        """
+        content = prepared.body
+        if content and email.body_is_html:
+            content = _html_to_text(content)
+        self._write_pdf(
+            pdf_file,
+            email,
+            prepared.to_field,
+            content or "No content available for this email.",
+        )
+
+    def _save_eml(self, email, prepared, output_path, file_saver):
+        """
+        Render a prepared email as .eml content and write it out.
+
+        Args:
+            email (EmailSnapshot): Snapshot of the email being saved.
+            prepared (PreparedEmail): The email's prepared content.
+            output_path (str): The directory path where the file will be saved.
+            file_saver (FileSaver or None): FileSaver that writes the file.
+        """
+        eml_data = self._render_eml(email, prepared.recipient_list, prepared.body)
+        self._write_output(
+            output_path, f"{prepared.file_stem}.eml", file_saver, eml_data
+        )
+
+    def _save_pdf(self, email, prepared, output_path, file_saver):
+        """
+        Render a prepared email as a PDF document and write it out.
+
+        Args:
+            email (EmailSnapshot): Snapshot of the email being saved.
+            prepared (PreparedEmail): The email's prepared content.
+            output_path (str): The directory path where the file will be saved.
+            file_saver (FileSaver or None): FileSaver that writes the file.
+        """
+        pdf_buffer = io.BytesIO()
+        self._write_pdf_prepared(pdf_buffer, email, prepared)
+        self._write_output(
+            output_path, f"{prepared.file_stem}.pdf", file_saver, pdf_buffer.getvalue()
+        )
+
+    def _write_output(self, output_path, file_name, file_saver, data):
+        """
+        Write a rendered output file, through file_saver when one is given.
+
+        Outputs are rendered in memory first, so a rendering error never
+        leaves a truncated file behind, and are renamed into place, so
+        concurrent writers of the same name never leave a mixed file.
+
+        Args:
+            output_path (str): The directory containing the file.
+            file_name (str): The file name within output_path.
+            file_saver (FileSaver or None): FileSaver whose write_file() is used.
+            data (bytes): The file content.
+        """
+        if file_saver is not None:
+            file_saver.write_file(output_path, file_name, data)
+            return
+        write_replacing(os.path.join(output_path, file_name), data)
+
+    def _file_stem(self, email):
+        """
+        Build the output filename, without extension, for an email.
+
+        Args:
+            email: The pypff email object.
+
+        Returns:
+            str: The date prefix followed by the sanitized, truncated subject.
         """
         # Format delivery time for filename
         date_prefix = self._format_delivery_time(email)
         subject = email.subject or "no_subject"
         # Remove invalid characters instead of replacing with dashes
-        clean_subject = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", subject)
-        file_name = f"{date_prefix} - {clean_subject[:50].strip()}.eml"
-        full_path = os.path.join(output_path, file_name)
+        clean_subject = subject
+        if _INVALID_FILENAME_RE.search(subject):
+            clean_subject = subject.translate(_INVALID_FILENAME_CHARS)
+        return f"{date_prefix} - {clean_subject[:50].strip()}"
+
+    def _extract_recipients(self, email):
+        """
+        Extract recipient information from the email's transport headers.
+
+        Args:
+            email: The pypff email object.
 
-        # Extract recipient information from transport headers
+        Returns:
+            tuple: (recipient_list, to_field) where recipient_list holds all
+                To, Cc and Bcc recipients for the .eml output and to_field is
+                the formatted To line for the .pdf output. Both fall back to
+                display_to and then to "Unknown Recipient".
+        """
         recipient_list = []
+        to_field = None
         transport_headers = getattr(email, "transport_headers", None)
         if transport_headers:
             try:
-                msg = py_email.message_from_string(
-                    transport_headers, policy=policy.default
-                )
+                msg = _HEADER_PARSER.parsestr(address_headers(transport_headers))
                 to_recipients = msg.get_all("To", [])
-                cc_recipients = msg.get_all("Cc", [])
-                bcc_recipients = msg.get_all("Bcc", [])
-                all_recipients = to_recipients + cc_recipients + bcc_recipients
+                all_recipients = itertools.chain(
+                    to_recipients, msg.get_all("Cc", ()), msg.get_all("Bcc", ())
+                )
                 recipient_list = [
                     str(recipient) for recipient in all_recipients if recipient
                 ]
+                if to_recipients:
+                    to_field = ", ".join(str(recipient) for recipient in to_recipients)
             except Exception:
                 pass
 
         # Fallback to display_to if available
-        if not recipient_list and hasattr(email, "display_to") and email.display_to:
-            recipient_list = [email.display_to]
+        display_to = getattr(email, "display_to", None)
+        if not recipient_list and display_to:
+            recipient_list = [display_to]
+        if not to_field and display_to:
+            to_field = display_to
 
         # Final fallback
         if not recipient_list:
             recipient_list = ["Unknown Recipient"]
+        if not to_field:
+            to_field = "Unknown Recipient"
+
+        return recipient_list, to_field
+
+    def _decode_body(self, body):
+        """
+        Return an email body as text, decoding it if it is in bytes.
+
+        Args:
+            body (str or bytes): The raw email body.
 
-        # Get email body and decode if it's in bytes
-        body = email.plain_text_body or email.html_body or ""
+        Returns:
+            str: The body as a string.
+        """
         if isinstance(body, bytes):
             # Try to detect encoding using multiple approaches
-            detected_body = self._decode_email_body(body)
-            body = detected_body
-
-        with open(full_path, "w", encoding="utf-8") as eml_file:
-            eml_file.write(f"Subject: {email.subject}\n")
-            eml_file.write(f"From: {email.sender_name}\n")
-            eml_file.write(f"To: {', '.join(recipient_list)}\n")
-            eml_file.write("\n")
-            eml_file.write(body)
+            return self._decode_email_body(body)
+        return body
 
-    def save_as_pdf(self, email, output_path):
+    def _render_eml(self, email, recipient_list, body):
         """
-        Save the email as a .pdf file using reportlab with headers and body content.
+        Render Subject, From and To headers and the body as .eml content.
 
         Args:
-            email: The pypff email object to save.
-            output_path (str): The directory path where the .pdf file will be saved.
+            email: The pypff email object being saved.
+            recipient_list (list): Recipients for the To header.
+            body (str): The decoded email body.
+
+        Returns:
+            bytes: The UTF-8 encoded .eml content.
+
+        Note:
+            The text is encoded to UTF-8 here rather than written through a
+            TextIOWrapper; line endings are written as "\n" on every platform.
         """
-        # Format delivery time for filename
-        date_prefix = self._format_delivery_time(email)
-        subject = email.subject or "no_subject"
-        # Remove invalid characters instead of replacing with dashes
-        clean_subject = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "", subject)
-        file_name = f"{date_prefix} - {clean_subject[:50].strip()}.pdf"
-        full_path = os.path.join(output_path, file_name)
-
-        # Use the email's plain text body if available, otherwise fall back to
-        # HTML or a default message
-        content = (
-            email.plain_text_body
-            or email.html_body
-            or "No content available for this email."
+        # The header block and the body are encoded in one call, and the
+        # resulting bytes are what gets written to disk, with no buffer in
+        # between
+        header = (
+            f"Subject: {email.subject}\n"
+            f"From: {email.sender_name}\n"
+            f"To: {', '.join(recipient_list)}\n"
+            "\n"
         )
+        return (header + body).encode("utf-8")
 
-        # Decode the body if it is in bytes
-        if isinstance(content, bytes):
-            content = self._decode_email_body(content)
+    def _write_pdf(self, pdf_file, email, to_field, content):
+        """
+        Render Subject, From and To headers and the body as a PDF document.
+
+        Args:
+            pdf_file: The binary file object to write to.
+            email: The pypff email object being saved.
+            to_field (str): The formatted To line.
+            content (str): The decoded email body.
+        """
+        # reportlab is imported on first use; dry runs and EML-only exports
+        # never pay for it
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
 
         # Create the PDF
-        c = canvas.Canvas(full_path, pagesize=letter)
+        c = canvas.Canvas(pdf_file, pagesize=letter)
         c.setFont("Helvetica", 12)
 
         # Write email headers
@@ -317,53 +861,45 @@ class EmailProcessor:
         sender_name = email.sender_name or "Unknown Sender"
         sender_email = email.sender_email_address or "Unknown Email"
         c.drawString(50, 730, f"From: {sender_name} <{sender_email}>")
-
-        # Extract recipient information from transport headers
-        to_field = "Unknown Recipient"
-        transport_headers = getattr(email, "transport_headers", None)
-        if transport_headers:
-            try:
-                msg = py_email.message_from_string(
-                    transport_headers, policy=policy.default
-                )
-                to_recipients = msg.get_all("To", [])
-                if to_recipients:
-                    to_field = ", ".join(str(recipient) for recipient in to_recipients)
-            except Exception:
-                pass
-
-        # Fallback to display_to if available
-        if (
-            to_field == "Unknown Recipient"
-            and hasattr(email, "display_to")
-            and email.display_to
-        ):
-            to_field = email.display_to
-
         c.drawString(50, 710, f"To: {to_field}")
 
-        # Write email body
-        y_position = 690
-        line_height = 14
-        for line in content.splitlines():
-            if (
-                y_position < 50
-            ):  # Start a new page if the content exceeds the current page
+        # Write the email body through one text object per page instead of a
+        # separate drawString call (and text block) for every line
+        text = self._begin_pdf_text(c, 690)
+        for line in _iter_lines(content):
+            # Start a new page if the content exceeds the current page
+            if text.getY() < 50:
+                c.drawText(text)
                 c.showPage()
-                c.setFont("Helvetica", 12)
-                y_position = 750
-            c.drawString(50, y_position, line)
-            y_position -= line_height
+                text = self._begin_pdf_text(c, 750)
+            text.textLine(line)
+        c.drawText(text)
 
         # Save the PDF
         c.save()
 
+    def _begin_pdf_text(self, c, y_position):
+        """
+        Start a text object for the email body at the left margin.
+
+        Args:
+            c (canvas.Canvas): The canvas being drawn on.
+            y_position (int): Baseline of the first line.
+
+        Returns:
+            reportlab.pdfgen.textobject.PDFTextObject: The text object, using
+                12pt Helvetica with 14pt line spacing.
+        """
+        text = c.beginText(50, y_position)
+        text.setFont("Helvetica", 12, leading=14)
+        return text
+
     def _format_delivery_time(self, email):
         """
         Format the delivery time for use in filenames as [YYYY-MM-DD].
 
-        Falls back to creation_time or current date if delivery_time is not
-        available.
+        Falls back to creation_time or the current date (taken once, when the
+        processor is created) if delivery_time is not available.
 
         Args:
             email: The email object containing delivery_time and creation_time
@@ -373,21 +909,18 @@ class EmailProcessor:
             str: Formatted date string in the format [YYYY-MM-DD].
         """
         try:
-            # Try to get delivery_time first
-            delivery_time = getattr(email, "delivery_time", None)
-            if delivery_time:
-                return f"[{delivery_time.strftime('%Y-%m-%d')}]"
-
-            # Fall back to creation_time
-            creation_time = getattr(email, "creation_time", None)
-            if creation_time:
-                return f"[{creation_time.strftime('%Y-%m-%d')}]"
-
-            # Last resort: use current date
-            return f"[{datetime.now().strftime('%Y-%m-%d')}]"
+            # Try delivery_time first, then fall back to creation_time
+            date = getattr(email, "delivery_time", None) or getattr(
+                email, "creation_time", None
+            )
+            if date:
+                return f"[{date.year:04d}-{date.month:02d}-{date.day:02d}]"
+
+            # Last resort: use the date the export started
+            return self._today
         except (AttributeError, TypeError):
             # If there's any error with date formatting, use current date
-            return f"[{datetime.now().strftime('%Y-%m-%d')}]"
+            return self._today
 
     def _decode_email_body(self, body_bytes):
         """
@@ -405,62 +938,226 @@ class EmailProcessor:
         if not isinstance(body_bytes, bytes):
             return str(body_bytes)
 
-        # List of encodings to try, in order of preference
-        # Based on common email encodings and Portuguese/international content
-        encodings_to_try = [
-            "utf-8",  # Most common modern encoding
-            "iso-8859-1",  # Latin-1, very common for European languages
-            "windows-1252",  # Windows Latin-1, common in Windows emails
-            "cp1252",  # Alternative name for windows-1252
-            "iso-8859-15",  # Latin-9, includes Euro symbol
-            "utf-16",  # Unicode with BOM
-            "utf-16le",  # Little-endian UTF-16
-            "utf-16be",  # Big-endian UTF-16
-            "ascii",  # Basic ASCII as last resort
-        ]
-
-        # First, try to detect if it's a double-encoded UTF-8 (common issue)
-        # This happens when UTF-8 encoded text is incorrectly decoded as Latin-1
-        # and then re-encoded as UTF-8
+        # UTF-8 is the most common modern encoding, so try it first. The
+        # mojibake checks below run on the raw bytes, so the common case never
+        # builds a second full-size copy of the body.
         try:
-            # Try decoding as Latin-1 first, then re-encode and decode as UTF-8
-            temp_decoded = body_bytes.decode("latin-1")
-            if any(
-                char in temp_decoded
-                for char in ["Ã§", "Ã£", "Ã¡", "Ã©", "Ã­", "Ã³", "Ãº"]
-            ):
-                # Likely double-encoded UTF-8, try to fix it
-                try:
-                    fixed_bytes = temp_decoded.encode("latin-1")
-                    return fixed_bytes.decode("utf-8")
-                except (UnicodeDecodeError, UnicodeEncodeError):
-                    pass
+            decoded = body_bytes.decode("utf-8")
         except UnicodeDecodeError:
-            pass
+            decoded = None
 
-        # Try each encoding in order
-        for encoding in encodings_to_try:
-            try:
-                decoded = body_bytes.decode(encoding)
+        if decoded is not None:
+            # Text containing double-encoded UTF-8 ("Ã§" for "ç") was probably
+            # not UTF-8 to begin with, unless correctly encoded accented
+            # characters appear as well
+            if not any(sigil in body_bytes for sigil in _DOUBLE_ENCODED_SIGILS):
+                return decoded
+            if any(sigil in body_bytes for sigil in _UTF8_SIGILS):
+                return decoded
 
-                # Validate the result - check for common problematic patterns
-                if encoding == "utf-8" and any(
-                    char in decoded for char in ["Ã§", "Ã£", "Ã¡"]
-                ):
-                    # This might be wrongly decoded UTF-8, skip to next encoding
-                    continue
+        # Latin-1 (very common for European languages) maps every byte to a
+        # character, so it always succeeds and no further encodings are needed
+        return body_bytes.decode("iso-8859-1")
 
-                # If we get here, the decoding worked
-                return decoded
 
-            except (UnicodeDecodeError, UnicodeError):
-                continue
+def _iter_lines(text):
+    """
+    Yield the lines of a string one at a time, like a lazy str.splitlines().
 
-        # If all encodings fail, use UTF-8 with error replacement as last resort
-        try:
-            return body_bytes.decode("utf-8", errors="replace")
-        except Exception:
-            # Absolute last resort
-            return (
-                f"Error: Could not decode email body (length: {len(body_bytes)} bytes)"
-            )
+    Args:
+        text (str): The text to split.
+
+    Yields:
+        str: Each line, without its line break.
+
+    Note:
+        Unlike splitlines(), no list holding every line of a large body is
+        built up front.
+    """
+    start = 0
+    for line_break in _LINE_BREAK.finditer(text):
+        yield text[start : line_break.start()]
+        start = line_break.end()
+    if start < len(text):
+        yield text[start:]
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """
+    Collect the visible text of an HTML document, one block per line.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HIDDEN_HTML_TAGS:
+            self._hidden_depth += 1
+        elif tag in _BLOCK_HTML_TAGS:
+            self.parts.append("\n")
+        elif tag in _CELL_HTML_TAGS:
+            self.parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closing tag such as <br/> counts once, like <br>; a
+        # self-closing hidden tag has no content to hide
+        if tag not in _HIDDEN_HTML_TAGS:
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in _HIDDEN_HTML_TAGS:
+            self._hidden_depth = max(self._hidden_depth - 1, 0)
+        elif tag in _BLOCK_HTML_TAGS and tag != "tr":
+            # Rows are broken at the next row's start, so consecutive rows
+            # are not separated by blank lines; the table's end tag ends the
+            # last one
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._hidden_depth:
+            self.parts.append(data)
+
+
+def _html_to_text(html):
+    """
+    Convert an HTML email body to plain text.
+
+    Args:
+        html (str): The HTML body.
+
+    Returns:
+        str: The visible text, with whitespace collapsed inside each line,
+            one line per block element and at most one blank line in a row.
+    """
+    extractor = _HTMLTextExtractor()
+    extractor.feed(html)
+    extractor.close()
+
+    lines = []
+    for raw_line in "".join(extractor.parts).split("\n"):
+        line = " ".join(raw_line.split())
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _chunked(iterable, size):
+    """
+    Split an iterable into lists of at most size items.
+
+    Args:
+        iterable: The items to split.
+        size (int): Maximum number of items per list.
+
+    Yields:
+        list: Consecutive chunks of the iterable.
+    """
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _flush_log(log_buffer, after_progress=False):
+    """
+    Write buffered log lines to stdout in one call and empty the buffer.
+
+    Args:
+        log_buffer (list): Log lines waiting to be written.
+        after_progress (bool, optional): Whether an in-place progress line is
+            currently shown and must be ended first. Defaults to False.
+    """
+    if log_buffer:
+        prefix = "\n" if after_progress else ""
+        sys.stdout.write(prefix + "\n".join(log_buffer) + "\n")
+        log_buffer.clear()
+
+
+def _flush_writes(file_saver, results):
+    """
+    Wait for a FileSaver's background writes and mark the emails whose files
+    could not be written as failed.
+
+    Args:
+        file_saver (FileSaver): The FileSaver the results were written with;
+            its write_tag was set to each email's index in results while the
+            email was exported.
+        results (list): (exported, log_lines) tuples of the emails just
+            exported, updated in place.
+    """
+    for tag, message in file_saver.flush():
+        if isinstance(tag, int) and 0 <= tag < len(results):
+            _, log = results[tag]
+            log.append(message)
+            results[tag] = (False, log)
+        else:
+            # Not queued on behalf of one of these emails
+            print(message)
+
+
+def _init_worker(file_path, output_dir):
+    """
+    Prepare an export pool worker by reopening the PST/OST file.
+
+    Args:
+        file_path (str): Path to the PST/OST file being exported.
+        output_dir (str): Output directory for extracted emails.
+    """
+    pst_file = pypff.file()
+    pst_file.open(file_path)
+    _worker_state["pst_file"] = pst_file
+    _worker_state["root_folder"] = pst_file.get_root_folder()
+    _worker_state["processor"] = EmailProcessor(file_path)
+    _worker_state["file_saver"] = FileSaver(output_dir, background_writes=True)
+
+
+def _export_one(email_ref, output_format, verbose):
+    """
+    Export one email inside a pool worker.
+
+    Args:
+        email_ref (dict): Email reference with 'folder_path' and 'location' keys.
+        output_format (str): Output format ('eml', 'pdf', or 'both').
+        verbose (bool): Enable verbose output.
+
+    Returns:
+        tuple: (exported, log_lines) where exported is True if the email was
+            saved and log_lines lists its progress and error messages.
+    """
+    folder_indices, message_index = email_ref["location"]
+    folder = _worker_state["root_folder"]
+    for index in folder_indices:
+        folder = folder.get_sub_folder(index)
+
+    email_data = {
+        "message": folder.get_sub_message(message_index),
+        "folder_path": email_ref["folder_path"],
+    }
+    log = []
+    exported = _worker_state["processor"]._export_email(
+        email_data, _worker_state["file_saver"], output_format, verbose, log
+    )
+    return exported, log
+
+
+def _export_chunk(email_refs, output_format, verbose):
+    """
+    Export a chunk of emails sequentially inside a pool worker.
+
+    Args:
+        email_refs (list): Email references with 'folder_path' and 'location'
+            keys.
+        output_format (str): Output format ('eml', 'pdf', or 'both').
+        verbose (bool): Enable verbose output.
+
+    Returns:
+        list: One (exported, log_lines) tuple per email, in chunk order.
+    """
+    file_saver = _worker_state["file_saver"]
+    results = []
+    for email_ref in email_refs:
+        file_saver.write_tag = len(results)
+        results.append(_export_one(email_ref, output_format, verbose))
+    _flush_writes(file_saver, results)
+    return results
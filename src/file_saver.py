@@ -1,10 +1,213 @@
-import email as py_email
+import codecs
+import collections
+import hashlib
+import io
 import os
+import queue
 import re
+import shutil
+import threading
 from email import policy
+from email.parser import HeaderParser
 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+# Translation table deleting characters that are invalid in filenames
+_INVALID_FILENAME_CHARS = str.maketrans(
+    "", "", '<>:"/\\|?*' + "".join(chr(i) for i in range(32))
+)
+
+# Any character _INVALID_FILENAME_CHARS deletes; searching for one is much
+# cheaper than translating a filename that has none
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# Email address between angle brackets in a From header
+_ANGLE_ADDRESS_RE = re.compile(r"<(.+?)>")
+
+# Transport headers are only read for sender and recipients; HeaderParser
+# stops at the end of the headers instead of building a full message
+_HEADER_PARSER = HeaderParser(policy=policy.default)
+
+# Physical header lines, each with its line break, split the way the email
+# parser splits them
+_HEADER_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+# Header name and colon at the start of a header line (RFC 5322 field name)
+_HEADER_NAME_RE = re.compile(r"[\041-\071\073-\176]*:")
+
+# Headers address_headers() keeps, lowercased with their colon
+_ADDRESS_HEADER_NAMES = frozenset({"from:", "to:", "cc:", "bcc:"})
+
+# Charset parameter of a Content-Type header in transport headers
+_CHARSET_RE = re.compile(
+    r"^content-type:(?:[^\r\n]|\r?\n[ \t])*?charset\s*=\s*[\"']?([\w.:-]+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Byte order marks and the codecs that decode (and drop) them
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Sender and recipients parsed from transport headers, as returned by
+# FileSaver._parse_transport_headers()
+ParsedHeaders = collections.namedtuple(
+    "ParsedHeaders", ["sender", "sender_email", "to_recipients", "recipients"]
+)
+
+# A failed background write, as returned by FileSaver.flush(): the write_tag
+# in effect when the file was queued, and the error message
+WriteError = collections.namedtuple("WriteError", ["tag", "message"])
+
+# Seconds the writer thread is given between liveness checks while a caller
+# waits on the write queue
+_WRITER_POLL_INTERVAL = 0.1
+
+# Maximum number of directory descriptors FileSaver.open_in() keeps open
+MAX_OPEN_DIRS = 64
+
+# Size of each read when copying attachment data out of the PST file
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+
+# Number of leading attachment bytes hashed to find duplicate attachments
+DEDUP_HEAD_SIZE = 4096
+
+# Maximum number of files queued for the background writer thread
+WRITE_QUEUE_SIZE = 256
+
+# Whether files can be opened relative to a directory descriptor (not on
+# Windows)
+_SUPPORTS_DIR_FD = os.open in os.supports_dir_fd
+
+
+def write_replacing(file_path, data):
+    """
+    Write a file through a temporary file renamed over the target.
+
+    Several worker processes may export emails with the same name into the
+    same folder. Renaming a complete temporary file into place means the
+    target always holds one whole file (the last one written) instead of
+    interleaved writes.
+
+    Args:
+        file_path (str): Path of the file to create or replace.
+        data (bytes): The file content.
+    """
+    folder_path, file_name = os.path.split(file_path)
+    temp_path = os.path.join(folder_path, _temp_name(file_name))
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _temp_name(file_name):
+    """
+    Build the name of the temporary file write_replacing() writes first.
+
+    Args:
+        file_name (str): Name of the target file.
+
+    Returns:
+        str: A hidden name unique to the calling process and thread.
+    """
+    return f".{file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def address_headers(transport_headers):
+    """
+    Reduce transport headers to the From, To, Cc and Bcc headers.
+
+    Transport headers are mostly Received, DKIM and other trace headers that
+    are never read. Dropping them before parsing means the email parser only
+    processes the few lines that matter.
+
+    Args:
+        transport_headers (str): The raw transport headers of an email.
+
+    Returns:
+        str: The From, To, Cc and Bcc headers, including their folded
+            continuation lines, in their original order.
+    """
+    kept = []
+    keep = False
+    for line in _HEADER_LINE_RE.findall(transport_headers):
+        if line[0] in " \t":
+            # Continuation of the previous header
+            if keep:
+                kept.append(line)
+        elif line in ("\r\n", "\n", "\r"):
+            # A blank line ends the header block
+            break
+        else:
+            name_match = _HEADER_NAME_RE.match(line)
+            if name_match:
+                keep = name_match.group().lower() in _ADDRESS_HEADER_NAMES
+                if keep:
+                    kept.append(line)
+            elif line.startswith("From "):
+                # Envelope line, skipped by the email parser as well
+                keep = False
+            else:
+                # Like the email parser, stop at the first non-header line
+                break
+    return "".join(kept)
+
+
+def _detect_encoding(transport_headers, data):
+    """
+    Pick the encoding of an email body without trial decoding.
+
+    Args:
+        transport_headers (str or None): The raw transport headers of the email,
+            or None when their charset does not apply to the body.
+        data (bytes): The email body.
+
+    Returns:
+        str: The codec of the body's byte order mark if it has one, else the
+            charset of its Content-Type header if Python knows it, else
+            "utf-8".
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if data.startswith(bom):
+            return encoding
+    if transport_headers:
+        match = _CHARSET_RE.search(transport_headers)
+        if match:
+            try:
+                return codecs.lookup(match.group(1)).name
+            except LookupError:
+                pass
+    return "utf-8"
+
+
+def _decode_body(data, transport_headers=None):
+    """
+    Decode an email body, never failing.
+
+    Args:
+        data (bytes): The email body.
+        transport_headers (str, optional): The raw transport headers of the
+            email, whose Content-Type charset is used when the body has no
+            byte order mark. Defaults to None (UTF-8).
+
+    Returns:
+        str: The decoded body; undecodable bytes are replaced, and UTF-8 is
+            used if the chosen codec cannot decode the body at all.
+    """
+    try:
+        return data.decode(_detect_encoding(transport_headers, data), errors="replace")
+    except Exception:
+        # bytes.decode() raises LookupError for codecs that are not text
+        # encodings, such as hex or base64
+        return data.decode("utf-8", errors="replace")
 
 
 class FileSaver:
@@ -20,33 +223,84 @@ class FileSaver:
 
     Attributes:
         base_directory (str): Base directory where all files will be saved.
+        _dir_cache (set): Directories already created by this instance.
+        _dirfd_cache (OrderedDict): Open directory descriptors used by
+            open_in(), least recently used first.
+        _attachment_paths (dict): Path of the first saved copy of each
+            attachment, keyed by (size, digest of the first bytes).
+        _attachments_dirs (dict): Attachments directory of each email folder.
+        _name_counters (dict): Next duplicate counter for each (folder, base
+            name, extension) handed out by _get_unique_filename().
+        _parsed_headers (tuple): The last email passed to
+            _parse_transport_headers() and its ParsedHeaders.
+        background_writes (bool): Whether write_file() writes in a background
+            thread.
+        _write_queue (queue.Queue): Files waiting for the writer thread.
+        _writer (threading.Thread): The writer thread, started on first use.
+        _write_errors (list): WriteError entries for failed background writes.
+        write_tag: Caller-defined value stored with each file queued by
+            write_file() and returned with its error, identifying which item
+            the file belongs to. Defaults to None.
     """
 
-    def __init__(self, base_directory):
+    def __init__(self, base_directory, background_writes=False):
         """
         Initialize the FileSaver with a base directory.
 
         Args:
             base_directory (str): The base directory where files will be saved.
+            background_writes (bool, optional): Whether write_file() hands files
+                to a background writer thread instead of writing them before
+                returning. Defaults to False.
         """
         self.base_directory = base_directory
+        self.background_writes = background_writes
+        self._write_queue = None
+        self._writer = None
+        self._write_errors = []
+        self.write_tag = None
+        self._dir_cache = set()
+        self._dirfd_cache = collections.OrderedDict()
+        self._attachment_paths = {}
+        self._attachments_dirs = {}
+        self._name_counters = {}
+        self._parsed_headers = (None, None)
 
     def save_email(self, email, folder_path, output_format="eml"):
         """
-        Save the email in the specified format while maintaining folder structure.
+        Save the email in the specified formats while maintaining folder structure.
 
         Args:
             email: The pypff email object to save.
             folder_path (str): The relative folder path where the email should be
                 saved.
-            output_format (str, optional): The output format ('eml' or 'pdf').
+            output_format (str or iterable, optional): The output format ('eml',
+                'pdf' or 'both'), or several formats such as ('eml', 'pdf').
                 Defaults to 'eml'.
+
+        Note:
+            The body is read and decoded once, however many formats are saved.
         """
+        if output_format == "both":
+            output_formats = ("eml", "pdf")
+        elif isinstance(output_format, str):
+            output_formats = (output_format,)
+        else:
+            output_formats = tuple(output_format)
+
         folder_path = self._create_full_path(folder_path)
-        if output_format == "eml":
-            self._save_as_eml(email, folder_path)
-        elif output_format == "pdf":
-            self._save_as_pdf(email, folder_path)
+        if "eml" not in output_formats and "pdf" not in output_formats:
+            return
+
+        try:
+            body = self._read_body(email)
+        except Exception:
+            # Each format reads the body again and reports the error itself
+            body = None
+        if "eml" in output_formats:
+            self._save_as_eml(email, folder_path, body)
+        if "pdf" in output_formats:
+            self._save_as_pdf(email, folder_path, body)
 
     def save_attachment(self, attachment, folder_path):
         """
@@ -60,7 +314,10 @@ class FileSaver:
         Note:
             If the attachment has no name, a default name will be generated.
             Duplicate filenames will be handled by appending a counter
-            (e.g., file_1.ext).
+            (e.g., file_1.ext). Data is read in ATTACHMENT_CHUNK_SIZE pieces,
+            so memory use does not grow with the attachment size. Attachments
+            identical to one already saved by this instance are hard-linked
+            to it instead of being written again.
         """
         try:
             # Get the attachment name and sanitize it
@@ -74,20 +331,45 @@ class FileSaver:
                 base_name = sanitized_name
                 extension = "bin"  # Default extension for files without one
 
-            # Get unique filename with counter if needed
-            attachment_path = self._get_unique_filename(
-                folder_path, base_name, extension
-            )
-
             # Check if attachment data is available
-            attachment_data = attachment.read_buffer()
-            if not attachment_data:
+            size = attachment.size
+            head = attachment.read_buffer(min(DEDUP_HEAD_SIZE, size)) if size else b""
+            if not head:
                 print(f"Warning: No data available for attachment '{attachment.name}'")
                 return
 
-            # Write the attachment content to a file
-            with open(attachment_path, "wb") as attachment_file:
-                attachment_file.write(attachment_data)
+            # Attachments repeated across a thread are hard-linked to the copy
+            # already saved. Size and a digest of the first bytes only select
+            # a candidate; the content is compared in full before linking.
+            dedup_key = (size, hashlib.blake2b(head, digest_size=16).digest())
+            original_path = self._attachment_paths.get(dedup_key)
+            if original_path:
+                if self._has_same_content(attachment, original_path, head, size):
+                    self._link_duplicate(
+                        original_path, folder_path, base_name, extension
+                    )
+                    return
+                attachment.seek_offset(len(head), os.SEEK_SET)
+
+            attachment_path, attachment_file = self._claim_unique_file(
+                folder_path, base_name, extension
+            )
+
+            # Copy the attachment content in bounded chunks so large
+            # attachments are never held in memory all at once
+            with attachment_file:
+                attachment_file.write(head)
+                remaining = size - len(head)
+                while remaining:
+                    chunk = attachment.read_buffer(
+                        min(ATTACHMENT_CHUNK_SIZE, remaining)
+                    )
+                    if not chunk:
+                        break
+                    attachment_file.write(chunk)
+                    remaining -= len(chunk)
+
+            self._attachment_paths.setdefault(dedup_key, attachment_path)
         except PermissionError as e:
             print(f"Permission denied saving attachment '{attachment.name}': {e}")
         except OSError as e:
@@ -95,6 +377,312 @@ class FileSaver:
         except Exception as e:
             print(f"Error saving attachment '{attachment.name}': {e}")
 
+    def _claim_unique_file(self, folder_path, base_name, extension):
+        """
+        Create a new, uniquely named file and open it for binary writing.
+
+        Args:
+            folder_path (str): The directory where the file will be created.
+            base_name (str): The base filename without extension.
+            extension (str): The file extension without the dot.
+
+        Returns:
+            tuple: (file_path, file_object) for the newly created file.
+
+        Note:
+            The name is claimed with an exclusive create so parallel export
+            workers never overwrite each other's files.
+        """
+        while True:
+            file_path = self._get_unique_filename(folder_path, base_name, extension)
+            try:
+                return file_path, self.open_in(
+                    folder_path, os.path.basename(file_path), "xb"
+                )
+            except FileExistsError:
+                continue
+
+    def _has_same_content(self, attachment, file_path, head, size):
+        """
+        Check whether an attachment has exactly the content of a saved file.
+
+        Args:
+            attachment: The pypff attachment object, positioned after head.
+            file_path (str): Path of the previously saved attachment.
+            head (bytes): The first bytes already read from the attachment.
+            size (int): Total size of the attachment in bytes.
+
+        Returns:
+            bool: True if the contents are identical, False otherwise.
+
+        Note:
+            The attachment is read in ATTACHMENT_CHUNK_SIZE pieces and compared
+            against the saved file, stopping at the first difference.
+        """
+        try:
+            with open(file_path, "rb") as saved_file:
+                if saved_file.read(len(head)) != head:
+                    return False
+                remaining = size - len(head)
+                while remaining:
+                    chunk = attachment.read_buffer(
+                        min(ATTACHMENT_CHUNK_SIZE, remaining)
+                    )
+                    if not chunk or saved_file.read(len(chunk)) != chunk:
+                        return False
+                    remaining -= len(chunk)
+                return not saved_file.read(1)
+        except OSError:
+            return False
+
+    def _link_duplicate(self, original_path, folder_path, base_name, extension):
+        """
+        Save a duplicate attachment as a hard link to an already saved copy.
+
+        Args:
+            original_path (str): Path of the previously saved attachment.
+            folder_path (str): The directory where the duplicate is saved.
+            base_name (str): The base filename without extension.
+            extension (str): The file extension without the dot.
+
+        Note:
+            Falls back to copying the file when hard links are not supported,
+            e.g. across filesystems or on FAT volumes.
+        """
+        while True:
+            link_path = self._get_unique_filename(folder_path, base_name, extension)
+            try:
+                os.link(original_path, link_path)
+                return
+            except FileExistsError:
+                continue
+            except OSError:
+                break
+
+        _, duplicate_file = self._claim_unique_file(folder_path, base_name, extension)
+        with duplicate_file, open(original_path, "rb") as original_file:
+            shutil.copyfileobj(original_file, duplicate_file, ATTACHMENT_CHUNK_SIZE)
+
+    def open_in(self, folder_path, file_name, mode="wb", encoding=None):
+        """
+        Open a file for writing inside a folder, relative to a cached
+        directory descriptor.
+
+        Writing many files into the same folder this way skips resolving the
+        full folder path again for every file. Falls back to a plain open()
+        where directory descriptors are not supported.
+
+        Args:
+            folder_path (str): The directory containing the file.
+            file_name (str): The file name within folder_path.
+            mode (str, optional): A write mode: 'w'/'wb' truncate an existing
+                file, 'x'/'xb' fail if it exists. Defaults to 'wb'.
+            encoding (str, optional): Text encoding for text modes.
+
+        Returns:
+            file object: The opened file.
+
+        Raises:
+            FileExistsError: If mode is exclusive and the file already exists.
+        """
+        if not _SUPPORTS_DIR_FD:
+            return open(os.path.join(folder_path, file_name), mode, encoding=encoding)
+
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if "x" in mode else os.O_TRUNC)
+        fd = os.open(file_name, flags, 0o666, dir_fd=self._get_dir_fd(folder_path))
+        return os.fdopen(fd, mode.replace("x", "w"), encoding=encoding)
+
+    def write_file(self, folder_path, file_name, data):
+        """
+        Write bytes to a file inside a folder, replacing any existing file.
+
+        The content goes to a temporary file that is then renamed over the
+        target (see write_replacing()), so concurrent writers never leave a
+        mixed file behind.
+
+        With background_writes enabled the file is queued for the writer
+        thread, so disk latency (e.g. on network shares) overlaps with reading
+        and rendering the next emails. At most WRITE_QUEUE_SIZE files are
+        queued; beyond that the caller waits for the writer.
+
+        Args:
+            folder_path (str): The directory containing the file.
+            file_name (str): The file name within folder_path.
+            data (bytes): The file content.
+
+        Note:
+            Background write errors are not raised here; they are returned by
+            the next flush(), tagged with the current write_tag.
+
+        Raises:
+            RuntimeError: If the writer thread has stopped unexpectedly.
+        """
+        if not self.background_writes:
+            self._write_replacing_in(folder_path, file_name, data)
+            return
+
+        if self._writer is None:
+            self._write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer = threading.Thread(
+                target=self._write_queued_files, name="FileSaver writer", daemon=True
+            )
+            self._writer.start()
+
+        # Never block forever on a full queue whose writer has died
+        entry = (os.path.join(folder_path, file_name), data, self.write_tag)
+        while True:
+            if not self._writer.is_alive():
+                raise RuntimeError("FileSaver writer thread has stopped")
+            try:
+                self._write_queue.put(entry, timeout=_WRITER_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def flush(self):
+        """
+        Wait until all files queued by write_file() have been written.
+
+        Returns:
+            list: WriteError entries for files that could not be written since
+                the last flush().
+
+        Note:
+            If the writer thread has died, the files it left in the queue are
+            reported as errors and a new thread is started by the next
+            write_file().
+        """
+        if self._writer is not None:
+            write_queue = self._write_queue
+            with write_queue.all_tasks_done:
+                while write_queue.unfinished_tasks and self._writer.is_alive():
+                    write_queue.all_tasks_done.wait(_WRITER_POLL_INTERVAL)
+            if not self._writer.is_alive():
+                self._drain_dead_writer()
+        errors, self._write_errors = self._write_errors, []
+        return errors
+
+    def _drain_dead_writer(self):
+        """
+        Report the files left in the queue of a writer thread that has died,
+        and forget the thread.
+        """
+        while True:
+            try:
+                entry = self._write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                file_path, _, tag = entry
+                self._write_errors.append(
+                    WriteError(
+                        tag, f"❌ Error writing '{file_path}': writer thread stopped"
+                    )
+                )
+        self._write_queue = None
+        self._writer = None
+
+    def close(self):
+        """
+        Finish pending background writes, stop the writer thread and close the
+        directory descriptors cached by open_in().
+
+        Note:
+            Errors from writes still pending are printed; call flush() first
+            to handle them instead.
+        """
+        for error in self.flush():
+            print(error.message)
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+        while self._dirfd_cache:
+            _, dir_fd = self._dirfd_cache.popitem()
+            os.close(dir_fd)
+
+    def _write_replacing_in(self, folder_path, file_name, data):
+        """
+        Like write_replacing(), relative to the folder's cached descriptor.
+
+        Args:
+            folder_path (str): The directory containing the file.
+            file_name (str): The file name within folder_path.
+            data (bytes): The file content.
+        """
+        if not _SUPPORTS_DIR_FD:
+            write_replacing(os.path.join(folder_path, file_name), data)
+            return
+
+        dir_fd = self._get_dir_fd(folder_path)
+        temp_name = _temp_name(file_name)
+        fd = os.open(
+            temp_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666, dir_fd=dir_fd
+        )
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_name, file_name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except BaseException:
+            try:
+                os.unlink(temp_name, dir_fd=dir_fd)
+            except OSError:
+                pass
+            raise
+
+    def _write_queued_files(self):
+        """
+        Writer thread loop: write queued files until a None entry arrives.
+
+        Note:
+            Files are opened by full path rather than through open_in(), whose
+            descriptor cache is owned by the calling thread.
+        """
+        while True:
+            entry = self._write_queue.get()
+            try:
+                if entry is None:
+                    return
+                file_path, data, tag = entry
+                try:
+                    write_replacing(file_path, data)
+                except Exception as e:
+                    # Any failure is reported; letting it escape would kill
+                    # the thread and leave callers waiting on the queue
+                    self._write_errors.append(
+                        WriteError(tag, f"❌ Error writing '{file_path}': {e}")
+                    )
+            finally:
+                self._write_queue.task_done()
+
+    def _get_dir_fd(self, folder_path):
+        """
+        Return a cached directory descriptor for a folder, opening it if needed.
+
+        At most MAX_OPEN_DIRS descriptors are kept; the least recently used one
+        is closed to make room so large folder trees cannot exhaust the
+        process's file descriptor limit.
+
+        Args:
+            folder_path (str): The directory to open.
+
+        Returns:
+            int: A directory file descriptor.
+        """
+        dir_fd = self._dirfd_cache.get(folder_path)
+        if dir_fd is not None:
+            self._dirfd_cache.move_to_end(folder_path)
+            return dir_fd
+
+        if len(self._dirfd_cache) >= MAX_OPEN_DIRS:
+            _, oldest_fd = self._dirfd_cache.popitem(last=False)
+            os.close(oldest_fd)
+
+        dir_fd = os.open(folder_path, os.O_RDONLY | os.O_DIRECTORY)
+        self._dirfd_cache[folder_path] = dir_fd
+        return dir_fd
+
     def _sanitize_filename(self, filename, max_length=200):
         """
         Sanitize a filename by removing invalid characters and limiting length.
@@ -110,9 +698,17 @@ class FileSaver:
         if not filename:
             return "unnamed_file"
 
+        # Fast path: most subjects are already clean and short enough
+        if (
+            len(filename) <= max_length
+            and filename[0] not in " ."
+            and filename[-1] not in " ."
+            and not _INVALID_FILENAME_RE.search(filename)
+        ):
+            return filename
+
         # Remove invalid characters for Windows and Unix
-        invalid_chars = r'[<>:"/\\|?*\x00-\x1f]'
-        sanitized = re.sub(invalid_chars, "", filename)
+        sanitized = filename.translate(_INVALID_FILENAME_CHARS)
 
         # Remove leading/trailing spaces and dots
         sanitized = sanitized.strip(" .")
@@ -142,18 +738,24 @@ class FileSaver:
             str: Full file path with a unique filename (e.g., file_1.ext,
                 file_2.ext).
         """
-        file_path = os.path.join(folder_path, f"{base_name}.{extension}")
-
-        if not os.path.exists(file_path):
-            return file_path
-
-        counter = 1
+        # Resume from the counter after the last name handed out for this
+        # base name, so a folder with n duplicates costs one existence check
+        # per call instead of n. Every candidate is still checked, which keeps
+        # files from earlier runs or other worker processes safe.
+        key = (folder_path, base_name, extension)
+        counter = self._name_counters.get(key, 0)
+        # Join the folder once; candidates are appended to it by plain
+        # concatenation instead of an os.path.join() call each
+        prefix = os.path.join(folder_path, "")
         while True:
-            new_filename = f"{base_name}_{counter}.{extension}"
-            file_path = os.path.join(folder_path, new_filename)
+            if counter:
+                file_path = f"{prefix}{base_name}_{counter}.{extension}"
+            else:
+                file_path = f"{prefix}{base_name}.{extension}"
+            counter += 1
             if not os.path.exists(file_path):
+                self._name_counters[key] = counter
                 return file_path
-            counter += 1
 
     def _create_full_path(self, folder_path):
         """
@@ -174,10 +776,9 @@ class FileSaver:
             OSError: If there's a filesystem error preventing directory
                 creation.
         """
+        full_path = os.path.join(self.base_directory, folder_path)
         try:
-            full_path = os.path.join(self.base_directory, folder_path)
-            os.makedirs(full_path, exist_ok=True)
-            return full_path
+            return self._ensure_directory(full_path)
         except PermissionError as e:
             print(f"Permission denied creating directory '{full_path}': {e}")
             raise
@@ -185,17 +786,119 @@ class FileSaver:
             print(f"OS error creating directory '{full_path}': {e}")
             raise
 
-    def _save_as_eml(self, email, folder_path):
+    def _create_attachments_path(self, folder_path):
+        """
+        Create the attachments subdirectory of an email folder.
+
+        The resolved path is remembered per folder, so emails after the first
+        one in a folder skip both the path join and the directory check.
+
+        Args:
+            folder_path (str): Full path of the folder the email is saved in.
+
+        Returns:
+            str: Full path of the folder's attachments directory.
+        """
+        attachments_path = self._attachments_dirs.get(folder_path)
+        if attachments_path is None:
+            attachments_path = self._ensure_directory(
+                os.path.join(folder_path, "attachments")
+            )
+            self._attachments_dirs[folder_path] = attachments_path
+        return attachments_path
+
+    def _ensure_directory(self, path):
+        """
+        Create a directory unless this instance has already created it.
+
+        Many emails share a folder, so remembering created directories saves
+        a stat/mkdir round-trip for every email after the first.
+
+        Args:
+            path (str): The directory path to create.
+
+        Returns:
+            str: The same directory path.
+        """
+        if path not in self._dir_cache:
+            os.makedirs(path, exist_ok=True)
+            self._dir_cache.add(path)
+        return path
+
+    def _parse_transport_headers(self, email):
+        """
+        Parse the sender and recipients from an email's transport headers.
+
+        The most recently parsed email is remembered, so saving one email in
+        several formats parses its headers only once.
+
+        Args:
+            email: The pypff email object; must have transport_headers.
+
+        Returns:
+            ParsedHeaders: The From header (None if missing), the address
+                between its angle brackets (None if there is none), the To
+                recipients, and all To, Cc and Bcc recipients.
+
+        Raises:
+            Exception: Any error raised while parsing the headers.
+        """
+        cached_email, parsed = self._parsed_headers
+        if cached_email is email:
+            return parsed
+
+        msg = _HEADER_PARSER.parsestr(address_headers(email.transport_headers))
+        sender = msg.get("From")
+        sender_email_match = _ANGLE_ADDRESS_RE.search(sender) if sender else None
+        to_recipients = msg.get_all("To", [])
+        parsed = ParsedHeaders(
+            sender=sender,
+            sender_email=sender_email_match.group(1) if sender_email_match else None,
+            to_recipients=to_recipients,
+            recipients=to_recipients + msg.get_all("Cc", []) + msg.get_all("Bcc", []),
+        )
+        self._parsed_headers = (email, parsed)
+        return parsed
+
+    def _read_body(self, email):
+        """
+        Read and decode the body of an email.
+
+        Args:
+            email: The pypff email object.
+
+        Returns:
+            str: The plain text body, or the HTML body if there is no plain
+                text. Empty if the email has no body.
+
+        Note:
+            libpff already converts the plain text body to UTF-8 from the
+            message codepage, so only a BOM can override UTF-8 for it. The
+            HTML body is the raw stored bytes and is decoded in the charset of
+            its Content-Type header.
+        """
+        body = email.plain_text_body
+        if body:
+            return _decode_body(body) if isinstance(body, bytes) else body
+
+        body = email.html_body or ""
+        if isinstance(body, bytes):
+            body = _decode_body(body, getattr(email, "transport_headers", None))
+        return body
+
+    def _save_as_eml(self, email, folder_path, body=None):
         """
         Saves the email as an .eml file with headers and body content.
 
         Args:
             email: The pypff email object to save.
             folder_path (str): The directory path where the .eml file will be saved.
+            body (str, optional): The body as returned by _read_body(); read
+                from the email when None.
 
         Note:
             - Attempts to extract proper email headers from transport_headers
-            - Handles various text encodings (UTF-8, Latin-1, CP1252, ASCII)
+            - Decodes the body as described in _read_body()
             - Uses unique filename generation to avoid conflicts
             - Falls back gracefully when headers cannot be parsed
         """
@@ -212,49 +915,27 @@ class FileSaver:
 
             if headers:
                 try:
-                    msg = py_email.message_from_string(headers, policy=policy.default)
-                    sender = msg.get("From", "Unknown Sender")
-                    sender_email_match = re.search(r"<(.+?)>", sender)
-                    if sender_email_match:
-                        sender_email = sender_email_match.group(1)
-
-                    to_recipients = msg.get_all("To", [])
-                    cc_recipients = msg.get_all("Cc", [])
-                    bcc_recipients = msg.get_all("Bcc", [])
-                    all_recipients = to_recipients + cc_recipients + bcc_recipients
-                    for recipient in all_recipients:
-                        recipient_list.append(recipient)
+                    parsed = self._parse_transport_headers(email)
+                    sender = parsed.sender or "Unknown Sender"
+                    if parsed.sender_email:
+                        sender_email = parsed.sender_email
+                    recipient_list.extend(parsed.recipients)
                 except Exception as e:
                     print(f"Warning: Error parsing email headers: {e}")
 
-            body = email.plain_text_body or email.html_body or b"No content available."
+            if body is None:
+                body = self._read_body(email)
+            body = body or "No content available."
 
-            # Decode the body if it is in bytes
-            if isinstance(body, bytes):
-                try:
-                    body = body.decode("utf-8", errors="replace")
-                except UnicodeDecodeError:
-                    # Try other common encodings
-                    for encoding in ["latin-1", "cp1252", "ascii"]:
-                        try:
-                            body = body.decode(encoding, errors="replace")
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        body = "Error: Could not decode email body"
-
-            # Write the email to an .eml file
-            with open(eml_file_path, "w", encoding="utf-8") as eml_file:
-                # Write headers
-                eml_file.write(f"Subject: {email.subject or 'No Subject'}\n")
-                eml_file.write(f"From: {sender} <{sender_email}>\n")
-                eml_file.write("To: ")
-                eml_file.write(", ".join(recipient_list))
-                eml_file.write("\n\n")  # Separate headers from the body
-
-                # Write body
-                eml_file.write(body)
+            # Write the email to an .eml file, encoded once and written in a
+            # single call; a blank line separates the headers from the body
+            payload = (
+                f"Subject: {email.subject or 'No Subject'}\n"
+                f"From: {sender} <{sender_email}>\n"
+                f"To: {', '.join(recipient_list)}\n"
+                f"\n{body}"
+            ).encode("utf-8")
+            self.write_file(folder_path, os.path.basename(eml_file_path), payload)
 
         except PermissionError as e:
             print(f"Permission denied saving email '{email.subject}': {e}")
@@ -263,19 +944,21 @@ class FileSaver:
         except Exception as e:
             print(f"Error saving email '{email.subject}': {e}")
 
-    def _save_as_pdf(self, email, folder_path):
+    def _save_as_pdf(self, email, folder_path, body=None):
         """
         Saves the email as a .pdf file using reportlab with headers and body content.
 
         Args:
             email: The pypff email object to save.
             folder_path (str): The directory path where the .pdf file will be saved.
+            body (str, optional): The body as returned by _read_body(); read
+                from the email when None.
 
         Note:
             - Creates a PDF with properly formatted email headers (Subject, From, To)
             - Handles multiple pages when content exceeds page boundaries
             - Attempts to extract recipient information from transport headers
-            - Supports various text encodings for email body content
+            - Decodes the body as described in _read_body()
             - Uses unique filename generation to avoid conflicts
         """
         try:
@@ -285,77 +968,57 @@ class FileSaver:
 
             # Use the email's plain text body if available, otherwise fall back
             # to HTML or a default message
-            content = (
-                email.plain_text_body
-                or email.html_body
-                or "No content available for this email."
-            )
-
-            # Decode the body if it is in bytes
-            if isinstance(content, bytes):
-                try:
-                    content = content.decode("utf-8", errors="replace")
-                except UnicodeDecodeError:
-                    # Try other common encodings
-                    for encoding in ["latin-1", "cp1252", "ascii"]:
-                        try:
-                            content = content.decode(encoding, errors="replace")
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        content = "Error: Could not decode email content"
-
-            # Create the PDF
-            c = canvas.Canvas(pdf_file_path, pagesize=letter)
+            if body is None:
+                body = self._read_body(email)
+            content = body or "No content available for this email."
+
+            # reportlab is imported on first use, only when a PDF is written
+            from reportlab.lib.pagesizes import letter
+            from reportlab.pdfgen import canvas
+
+            # Create the PDF in memory, so a rendering error never leaves a
+            # truncated file behind and the write can go to the writer thread
+            pdf_buffer = io.BytesIO()
+            c = canvas.Canvas(pdf_buffer, pagesize=letter)
             c.setFont("Helvetica", 12)
 
             # Write email headers
             c.drawString(50, 750, f"Subject: {email.subject or 'No Subject'}")
             sender = getattr(email, "sender_name", "Unknown Sender")
             sender_email = "Unknown Email"
-            transport_headers = getattr(email, "transport_headers", None)
-            if transport_headers:
-                try:
-                    msg = py_email.message_from_string(
-                        transport_headers, policy=policy.default
-                    )
-                    sender_field = msg.get("From", "Unknown Sender")
-                    sender_email_match = re.search(r"<(.+?)>", sender_field)
-                    if sender_email_match:
-                        sender_email = sender_email_match.group(1)
-                        sender = sender_field
-                except Exception:
-                    pass
-            c.drawString(50, 730, f"From: {sender} <{sender_email}>")
             to_field = "Unknown Recipient"
-            if transport_headers:
+            if getattr(email, "transport_headers", None):
                 try:
-                    msg = py_email.message_from_string(
-                        transport_headers, policy=policy.default
-                    )
-                    to_recipients = msg.get_all("To", [])
-                    if to_recipients:
-                        to_field = ", ".join(to_recipients)
+                    parsed = self._parse_transport_headers(email)
+                    if parsed.sender_email:
+                        sender_email = parsed.sender_email
+                        sender = parsed.sender
+                    if parsed.to_recipients:
+                        to_field = ", ".join(parsed.to_recipients)
                 except Exception:
                     pass
+            c.drawString(50, 730, f"From: {sender} <{sender_email}>")
             c.drawString(50, 710, f"To: {to_field}")
 
-            # Write email body
-            y_position = 690
-            line_height = 14
+            # Write email body through one text object per page instead of a
+            # separate drawString call (and text block) for every line
+            text = c.beginText(50, 690)
+            text.setFont("Helvetica", 12, leading=14)
             for line in content.splitlines():
-                if (
-                    y_position < 50
-                ):  # Start a new page if the content exceeds the current page
+                # Start a new page if the content exceeds the current page
+                if text.getY() < 50:
+                    c.drawText(text)
                     c.showPage()
-                    c.setFont("Helvetica", 12)
-                    y_position = 750
-                c.drawString(50, y_position, line)
-                y_position -= line_height
+                    text = c.beginText(50, 750)
+                    text.setFont("Helvetica", 12, leading=14)
+                text.textLine(line)
+            c.drawText(text)
 
             # Save the PDF
             c.save()
+            self.write_file(
+                folder_path, os.path.basename(pdf_file_path), pdf_buffer.getvalue()
+            )
 
         except PermissionError as e:
             print(f"Permission denied saving PDF '{email.subject}': {e}")
@@ -1,4 +1,3 @@
-import glob
 import os
 
 
@@ -25,43 +24,66 @@ class PSTProcessor:
         """
         self.pst_directory = pst_directory
 
-    def find_pst_files(self):
+    def find_pst_files(self, sort=True):
         """
         Find all PST/OST files in the configured PST directory.
 
+        Args:
+            sort (bool, optional): Whether to sort the paths. Callers that do
+                not care about the order can pass False to skip the sort.
+                Defaults to True.
+
         Returns:
-            list: A sorted list of file paths to PST/OST files found in the
-                PST directory. Returns an empty list if no files are found
-                or if the directory doesn't exist.
+            list: A list of file paths to PST/OST files found in the PST
+                directory, sorted unless sort is False. Returns an empty list
+                if no files are found or if the directory doesn't exist.
 
         Note:
             Creates the PST directory if it doesn't exist.
         """
-        if not os.path.exists(self.pst_directory):
+        try:
+            entries = os.scandir(self.pst_directory)
+        except FileNotFoundError:
             os.makedirs(self.pst_directory, exist_ok=True)
             return []
 
-        pst_files = glob.glob(os.path.join(self.pst_directory, "*.pst")) + glob.glob(
-            os.path.join(self.pst_directory, "*.ost")
-        )
-        return sorted(pst_files)
+        # One directory pass; the suffix check is case-insensitive so that
+        # files like ARCHIVE.PST are found on case-sensitive filesystems too.
+        # Hidden files such as macOS "._archive.pst" AppleDouble files are
+        # skipped, as glob skipped them before
+        with entries:
+            pst_files = [
+                entry.path
+                for entry in entries
+                if not entry.name.startswith(".")
+                and entry.is_file()
+                and entry.name.lower().endswith((".pst", ".ost"))
+            ]
+        if sort:
+            pst_files.sort()
+        return pst_files
 
     def validate_pst_file(self, file_path):
         """
         Validate that a given file path points to a valid PST/OST file.
 
         Args:
-            file_path (str): Path to the PST/OST file to validate.
+            file_path (str or os.PathLike): Path to the PST/OST file to validate.
 
         Returns:
             bool: True if the file exists and has a valid PST/OST extension,
                 False otherwise.
         """
-        if not file_path or not os.path.exists(file_path):
+        if not file_path:
             return False
 
-        file_extension = os.path.splitext(file_path)[1].lower()
-        return file_extension in [".pst", ".ost"]
+        # The extension check is done first, so paths with another
+        # extension never reach the filesystem
+        file_path = os.fspath(file_path)
+        if file_path[-4:].lower() not in (".pst", ".ost"):
+            return False
+
+        return os.path.exists(file_path)
 
     def get_pst_files_count(self):
         """
@@ -70,7 +92,7 @@ class PSTProcessor:
         Returns:
             int: Number of PST/OST files found in the directory.
         """
-        return len(self.find_pst_files())
+        return len(self.find_pst_files(sort=False))
 
     def ensure_pst_directory_exists(self):
         """
@@ -81,8 +103,7 @@ class PSTProcessor:
                 False if creation failed.
         """
         try:
-            if not os.path.exists(self.pst_directory):
-                os.makedirs(self.pst_directory, exist_ok=True)
+            os.makedirs(self.pst_directory, exist_ok=True)
             return True
         except OSError as e:
             print(f"Error creating PST directory '{self.pst_directory}': {e}")
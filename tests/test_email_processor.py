@@ -1,6 +1,35 @@
+import os
+import shutil
+import sys
+import tempfile
 import unittest
+from datetime import datetime
+from unittest import mock
 
-from src.email_processor import EmailProcessor
+from src.email_processor import (
+    EmailProcessor,
+    _flush_writes,
+    _html_to_text,
+    _iter_lines,
+)
+from src.file_saver import WriteError
+
+
+class _FakeFolder:
+    """Minimal stand-in for a pypff folder object."""
+
+    def __init__(self, name, messages=(), sub_folders=()):
+        self.name = name
+        self._messages = list(messages)
+        self._sub_folders = list(sub_folders)
+        self.number_of_sub_messages = len(self._messages)
+        self.number_of_sub_folders = len(self._sub_folders)
+
+    def get_sub_message(self, index):
+        return self._messages[index]
+
+    def get_sub_folder(self, index):
+        return self._sub_folders[index]
 
 
 class TestEmailProcessor(unittest.TestCase):
@@ -36,6 +65,123 @@ class TestEmailProcessor(unittest.TestCase):
         self.assertIsInstance(emails, list)
         self.assertGreater(len(emails), 0)
 
+    def test_extract_messages_records_location(self):
+        """
+        Test that extracted emails record where they live in the PST tree.
+
+        Verifies that:
+        - Each email carries its folder path
+        - Each email carries (folder_indices, message_index) so worker
+          processes can locate it again after reopening the PST file
+        """
+        inbox = _FakeFolder("Inbox", messages=["m1", "m2"])
+        root = _FakeFolder("", messages=["m0"], sub_folders=[inbox])
+
+        self.processor.extract_messages(root)
+
+        locations = [
+            (email_data["folder_path"], email_data["location"])
+            for email_data in self.processor.emails
+        ]
+        self.assertEqual(
+            locations,
+            [("", ((), 0)), ("Inbox", ((0,), 0)), ("Inbox", ((0,), 1))],
+        )
+
+    def test_extract_messages_handles_deep_folders(self):
+        """
+        Test extracting messages from a folder tree deeper than the recursion
+        limit.
+
+        Verifies that:
+        - The walk does not raise RecursionError
+        - The message in the deepest folder is found with its full location
+        """
+        depth = sys.getrecursionlimit() + 100
+        folder = _FakeFolder("Leaf", messages=["deep"])
+        for _ in range(depth - 1):
+            folder = _FakeFolder("Sub", sub_folders=[folder])
+
+        self.processor.extract_messages(folder)
+
+        self.assertEqual(len(self.processor.emails), 1)
+        self.assertEqual(self.processor.emails[0]["location"], ((0,) * (depth - 1), 0))
+
+    def test_decode_email_body(self):
+        """
+        Test decoding email bodies in the supported encodings.
+
+        Verifies that:
+        - UTF-8 bodies are decoded as UTF-8
+        - Bodies that are not valid UTF-8 fall back to Latin-1
+        - Double-encoded UTF-8 without other accented text falls back to Latin-1
+        """
+        decode = self.processor._decode_email_body
+        self.assertEqual(decode("Ação".encode("utf-8")), "Ação")
+        self.assertEqual(decode("Ação".encode("latin-1")), "Ação")
+        self.assertEqual(decode("AÃ§Ã£o".encode("utf-8")), "AÃ\x83Â§Ã\x83Â£o")
+
+    def test_iter_lines_matches_splitlines(self):
+        """
+        Test that _iter_lines() splits text exactly like str.splitlines().
+        """
+        for text in ("", "one", "one\n", "a\r\nb\rc\n\nd", "x\x0cy\u2028z\r"):
+            with self.subTest(text=text):
+                self.assertEqual(list(_iter_lines(text)), text.splitlines())
+
+    def test_html_to_text(self):
+        """
+        Test converting an HTML-only body to text for the PDF output.
+
+        Verifies that:
+        - Tags are removed and entities are decoded
+        - Block elements start new lines
+        - Script and style contents are dropped
+        """
+        html = (
+            "<html><head><style>p { color: red; }</style></head><body>"
+            "<p>Hello &amp; <b>welcome</b></p><p>Line one<br>Line   two</p>"
+            "<script>alert(1)</script></body></html>"
+        )
+        self.assertEqual(_html_to_text(html), "Hello & welcome\n\nLine one\nLine two")
+
+    def test_html_to_text_tables_and_void_tags(self):
+        """
+        Test converting table layouts and self-closing tags to text.
+
+        Verifies that:
+        - Table cells in a row are separated instead of run together
+        - <br/> breaks a line exactly like <br>
+        - A self-closing <script/> does not hide the rest of the body
+        """
+        html = (
+            "<table><tr><th>Name</th><th>Value</th></tr>"
+            "<tr><td>Alice</td><td>42</td></tr></table>"
+        )
+        self.assertEqual(_html_to_text(html), "Name Value\nAlice 42")
+        self.assertEqual(_html_to_text("a<br/>b"), _html_to_text("a<br>b"))
+        self.assertEqual(_html_to_text("a<br/>b"), "a\nb")
+        self.assertEqual(_html_to_text("<script/>shown"), "shown")
+
+    def test_flush_writes_marks_the_failed_email(self):
+        """
+        Test that a failed background write is reported with its own email.
+
+        Verifies that:
+        - The email whose file failed is marked as not exported
+        - The error is added to that email's log, not the last email's
+        """
+        file_saver = mock.Mock()
+        file_saver.flush.return_value = [WriteError(0, "❌ Error writing 'a.eml'")]
+        results = [(True, ["first"]), (True, ["second"])]
+
+        _flush_writes(file_saver, results)
+
+        self.assertEqual(
+            results,
+            [(False, ["first", "❌ Error writing 'a.eml'"]), (True, ["second"])],
+        )
+
     def test_save_as_eml(self):
         """
         Test saving an email as .eml format.
@@ -70,6 +216,60 @@ class TestEmailProcessor(unittest.TestCase):
         self.processor.save_as_pdf(email, output_path)
         self.assertTrue(True)  # Add assertions to verify the file was saved correctly
 
+    def test_save_both(self):
+        """
+        Test saving an email as .eml and .pdf in one call.
+
+        Verifies that:
+        - Both files are created with the same date-prefixed name
+        - The .eml file contains the To/Cc recipients and the decoded body
+        """
+        email = type(
+            "Email",
+            (object,),
+            {
+                "subject": "Both: Formats?",
+                "sender_name": "Alice",
+                "sender_email_address": "alice@example.com",
+                "plain_text_body": "Ol\u00e1 mundo".encode("utf-8"),
+                "html_body": None,
+                "transport_headers": (
+                    "To: Bob <bob@example.com>\r\nCc: carol@example.com\r\n\r\n"
+                ),
+                "delivery_time": datetime(2024, 3, 15),
+            },
+        )()
+        output_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_path)
+
+        self.processor.save_both(email, output_path)
+
+        stem = os.path.join(output_path, "[2024-03-15] - Both Formats")
+        self.assertTrue(os.path.exists(f"{stem}.pdf"))
+        with open(f"{stem}.eml", "r", encoding="utf-8") as eml_file:
+            content = eml_file.read()
+        self.assertIn("To: Bob <bob@example.com>, carol@example.com", content)
+        self.assertIn("Ol\u00e1 mundo", content)
+
+    def test_save_both_reads_each_property_once(self):
+        """
+        Test that saving both formats reads each email property only once.
+        """
+        reads = []
+
+        class Email:
+            def __getattr__(self, name):
+                reads.append(name)
+                return "Plain body" if name == "plain_text_body" else None
+
+        output_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_path)
+
+        self.processor.save_both(Email(), output_path)
+
+        self.assertEqual(len(reads), len(set(reads)))
+        self.assertNotIn("html_body", reads)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,10 @@
 import os
 import shutil
 import unittest
+from unittest import mock
 
-from src.file_saver import FileSaver
+from src import file_saver as file_saver_module
+from src.file_saver import FileSaver, _decode_body, _detect_encoding, address_headers
 
 
 class TestFileSaver(unittest.TestCase):
@@ -127,6 +129,383 @@ class TestFileSaver(unittest.TestCase):
             content = file.read()
         self.assertIn("This is a structured email.", content)
 
+    def test_create_full_path_caches_created_directories(self):
+        """
+        Test that each directory is only created once per FileSaver.
+
+        Verifies that:
+        - The directory is created on first use
+        - Later calls for the same folder skip os.makedirs entirely
+        """
+        full_path = self.file_saver._create_full_path("cached/emails")
+        self.assertTrue(os.path.isdir(full_path))
+
+        with mock.patch("os.makedirs") as makedirs:
+            self.assertEqual(
+                self.file_saver._create_full_path("cached/emails"), full_path
+            )
+        makedirs.assert_not_called()
+
+    def test_open_in_writes_relative_to_folder(self):
+        """
+        Test opening files through cached directory descriptors.
+
+        Verifies that:
+        - Files are written inside the given folder
+        - Exclusive mode refuses to overwrite an existing file
+        - No more than MAX_OPEN_DIRS descriptors stay open, and close()
+          releases them all
+        """
+        folders = [self.file_saver._create_full_path(f"fd/folder{i}") for i in range(3)]
+
+        with mock.patch.object(file_saver_module, "MAX_OPEN_DIRS", 2):
+            for folder in folders:
+                with self.file_saver.open_in(folder, "note.txt", "w", "utf-8") as f:
+                    f.write("hello")
+                self.assertLessEqual(len(self.file_saver._dirfd_cache), 2)
+
+        with open(os.path.join(folders[0], "note.txt"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "hello")
+        with self.assertRaises(FileExistsError):
+            self.file_saver.open_in(folders[0], "note.txt", "xb")
+
+        self.file_saver.close()
+        self.assertEqual(len(self.file_saver._dirfd_cache), 0)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_open_in_leaves_permissions_to_umask(self):
+        """
+        Test that open_in() creates files like open() does.
+
+        Verifies that:
+        - The file mode is 0o666 masked by the process umask
+        """
+        folder = self.file_saver._create_full_path("umask")
+        old_umask = os.umask(0o002)
+        try:
+            with self.file_saver.open_in(folder, "note.bin", "wb") as f:
+                f.write(b"data")
+        finally:
+            os.umask(old_umask)
+
+        mode = os.stat(os.path.join(folder, "note.bin")).st_mode & 0o777
+        self.assertEqual(mode, 0o664)
+
+    def test_write_file_in_background(self):
+        """
+        Test writing files through the background writer thread.
+
+        Verifies that:
+        - Queued files are on disk once flush() returns
+        - Failed writes are reported by flush() instead of being raised
+        - Each error carries the write_tag of the file that failed
+        - Non-OSError failures do not stop the writer thread
+        """
+        file_saver = FileSaver(self.test_base_directory, background_writes=True)
+        self.addCleanup(file_saver.close)
+        folder = file_saver._create_full_path("queued")
+
+        file_saver.write_tag = "first"
+        file_saver.write_file(folder, "one.eml", b"first")
+        file_saver.write_tag = "second"
+        file_saver.write_file(os.path.join(folder, "missing"), "two.eml", b"second")
+        file_saver.write_tag = "third"
+        file_saver.write_file(folder, "three.eml", "not bytes")
+        file_saver.write_tag = "fourth"
+        file_saver.write_file(folder, "four.eml", b"fourth")
+        errors = file_saver.flush()
+
+        with open(os.path.join(folder, "one.eml"), "rb") as f:
+            self.assertEqual(f.read(), b"first")
+        with open(os.path.join(folder, "four.eml"), "rb") as f:
+            self.assertEqual(f.read(), b"fourth")
+        self.assertEqual([error.tag for error in errors], ["second", "third"])
+        self.assertIn("two.eml", errors[0].message)
+        self.assertEqual(file_saver.flush(), [])
+
+    def test_write_file_replaces_through_temporary_file(self):
+        """
+        Test that write_file() renames a complete file over the target.
+
+        Verifies that:
+        - An existing file is replaced with the new content
+        - No temporary file is left behind, also when the write fails
+        """
+        folder = self.file_saver._create_full_path("replaced")
+        self.file_saver.write_file(folder, "same.eml", b"first version")
+        self.file_saver.write_file(folder, "same.eml", b"second")
+
+        with open(os.path.join(folder, "same.eml"), "rb") as f:
+            self.assertEqual(f.read(), b"second")
+        with self.assertRaises(TypeError):
+            self.file_saver.write_file(folder, "bad.eml", "not bytes")
+        self.assertEqual(os.listdir(folder), ["same.eml"])
+
+    def test_flush_reports_files_of_dead_writer(self):
+        """
+        Test that flush() does not hang when the writer thread has died.
+
+        Verifies that:
+        - Files still queued are reported as errors with their tags
+        - The next write starts a new writer thread
+        """
+        file_saver = FileSaver(self.test_base_directory, background_writes=True)
+        self.addCleanup(file_saver.close)
+        folder = file_saver._create_full_path("dead")
+
+        # Start the writer, then stop it as if it had died and queue a file
+        # that it will never write
+        file_saver.write_file(folder, "first.eml", b"first")
+        file_saver._write_queue.put(None)
+        file_saver._writer.join()
+        file_saver._write_queue.put((os.path.join(folder, "lost.eml"), b"x", "tag"))
+
+        errors = file_saver.flush()
+
+        self.assertEqual([error.tag for error in errors], ["tag"])
+        self.assertFalse(os.path.exists(os.path.join(folder, "lost.eml")))
+        file_saver.write_file(folder, "saved.eml", b"saved")
+        self.assertEqual(file_saver.flush(), [])
+        self.assertTrue(os.path.exists(os.path.join(folder, "saved.eml")))
+
+    def test_get_unique_filename_resumes_counter(self):
+        """
+        Test that unique filenames continue from the last counter handed out.
+
+        Verifies that:
+        - Duplicates are numbered file.ext, file_1.ext, file_2.ext, ...
+        - Each call checks a single candidate when no foreign files exist
+        - Files created by someone else are still skipped
+        """
+        folder = self.file_saver._create_full_path("unique")
+        names = []
+        with mock.patch("os.path.exists", wraps=os.path.exists) as exists:
+            for _ in range(3):
+                path = self.file_saver._get_unique_filename(folder, "Re whoa", "eml")
+                open(path, "w").close()
+                names.append(os.path.basename(path))
+        self.assertEqual(names, ["Re whoa.eml", "Re whoa_1.eml", "Re whoa_2.eml"])
+        self.assertEqual(exists.call_count, 3)
+
+        open(os.path.join(folder, "Re whoa_3.eml"), "w").close()
+        path = self.file_saver._get_unique_filename(folder, "Re whoa", "eml")
+        self.assertEqual(os.path.basename(path), "Re whoa_4.eml")
+
+    def test_transport_headers_parsed_once_per_email(self):
+        """
+        Test that saving one email as EML and PDF parses its headers once.
+        """
+        email = type(
+            "Email",
+            (object,),
+            {
+                "subject": "Parsed Once",
+                "sender_name": "Alice",
+                "transport_headers": "From: Alice <a@x.com>\r\nTo: b@y.com\r\n\r\n",
+                "plain_text_body": "Body",
+                "html_body": None,
+            },
+        )()
+        folder = self.file_saver._create_full_path("parsed")
+        parser = file_saver_module._HEADER_PARSER
+        with mock.patch.object(parser, "parsestr", wraps=parser.parsestr) as parsestr:
+            self.file_saver._save_as_eml(email, folder)
+            self.file_saver._save_as_pdf(email, folder)
+        self.assertEqual(parsestr.call_count, 1)
+
+        with open(os.path.join(folder, "Parsed Once.eml"), encoding="utf-8") as f:
+            self.assertIn("To: b@y.com", f.read())
+
+    def test_save_email_in_several_formats(self):
+        """
+        Test saving one email as EML and PDF in a single call.
+
+        Verifies that:
+        - Both files are written
+        - The body is read from the email only once
+        """
+        reads = []
+
+        class Email:
+            subject = "Two Formats"
+            transport_headers = None
+            html_body = None
+
+            @property
+            def plain_text_body(self):
+                reads.append("plain_text_body")
+                return "Caf\u00e9".encode("utf-8")
+
+        self.file_saver.save_email(Email(), "formats", ("eml", "pdf"))
+
+        folder = os.path.join(self.test_base_directory, "formats")
+        self.assertEqual(
+            sorted(os.listdir(folder)), ["Two Formats.eml", "Two Formats.pdf"]
+        )
+        with open(os.path.join(folder, "Two Formats.eml"), encoding="utf-8") as f:
+            self.assertIn("Caf\u00e9", f.read())
+        self.assertEqual(reads, ["plain_text_body"])
+
+    def test_address_headers_keeps_only_address_fields(self):
+        """
+        Test reducing transport headers to From, To, Cc and Bcc.
+
+        Verifies that:
+        - Trace headers are dropped, address headers keep their folded lines
+        - Scanning stops at the blank line ending the headers
+        """
+        headers = (
+            "Received: from mx.example.com\r\n\tby relay.example.com\r\n"
+            "From: Alice <a@x.com>\r\n"
+            "To: Bob <b@y.com>,\r\n c@z.com\r\n"
+            "Subject: Hello\r\n"
+            "\r\n"
+            "Cc: not@a.header\r\n"
+        )
+        self.assertEqual(
+            address_headers(headers),
+            "From: Alice <a@x.com>\r\nTo: Bob <b@y.com>,\r\n c@z.com\r\n",
+        )
+
+    def test_detect_encoding(self):
+        """
+        Test picking the encoding of an email body.
+
+        Verifies that:
+        - A byte order mark takes precedence over the headers
+        - The charset of a folded Content-Type header is used
+        - Unknown or missing charsets fall back to UTF-8
+        """
+        headers = 'Content-Type: text/plain;\r\n\tcharset="windows-1252"\r\n'
+        self.assertEqual(_detect_encoding(headers, b"\xef\xbb\xbfhi"), "utf-8-sig")
+        self.assertEqual(_detect_encoding(None, b"\xff\xfeh\x00"), "utf-16")
+        self.assertEqual(_detect_encoding(headers, b"caf\xe9"), "cp1252")
+        self.assertEqual(
+            _detect_encoding("Content-Type: text/plain; charset=bogus\r\n", b""),
+            "utf-8",
+        )
+        self.assertEqual(_detect_encoding("Subject: Hi\r\n", b""), "utf-8")
+
+    def test_non_text_charset_falls_back_to_utf8(self):
+        """
+        Test that a bytes-to-bytes codec named as charset does not lose the email.
+
+        Verifies that:
+        - A body whose charset is hex is decoded as UTF-8
+        - The EML file is still written with the HTML body
+        """
+        email = type(
+            "Email",
+            (object,),
+            {
+                "subject": "Hex Charset",
+                "transport_headers": "Content-Type: text/html; charset=hex\r\n",
+                "plain_text_body": None,
+                "html_body": "<p>Caf\u00e9</p>".encode("utf-8"),
+            },
+        )()
+        self.assertEqual(
+            _decode_body(email.html_body, email.transport_headers),
+            "<p>Caf\u00e9</p>",
+        )
+
+        self.file_saver.save_email(email, "hex", "eml")
+
+        eml_path = os.path.join(self.test_base_directory, "hex", "Hex Charset.eml")
+        with open(eml_path, encoding="utf-8") as f:
+            self.assertIn("<p>Caf\u00e9</p>", f.read())
+
+    def test_plain_text_body_ignores_header_charset(self):
+        """
+        Test that the plain text body stays UTF-8 whatever the header charset.
+
+        libpff converts the plain text body to UTF-8 already, so a Latin-1
+        Content-Type header must not be applied to it again.
+        """
+        email = type(
+            "Email",
+            (object,),
+            {
+                "subject": "Latin Header",
+                "transport_headers": (
+                    "Content-Type: text/plain; charset=iso-8859-1\r\n"
+                ),
+                "plain_text_body": "Caf\u00e9".encode("utf-8"),
+                "html_body": None,
+            },
+        )()
+
+        self.assertEqual(self.file_saver._read_body(email), "Caf\u00e9")
+
+    def test_save_attachment_reads_in_chunks(self):
+        """
+        Test that attachment data is copied in bounded chunks.
+
+        Verifies that:
+        - No single read asks for more than ATTACHMENT_CHUNK_SIZE bytes
+        - The saved file contains the full attachment data
+        """
+        data = b"0123456789"
+        requested = []
+
+        class Attachment:
+            name = "chunked.bin"
+            size = len(data)
+
+            def read_buffer(self, size):
+                requested.append(size)
+                offset = sum(requested[:-1])
+                return data[offset : offset + size]
+
+        folder = self.file_saver._create_full_path("chunks")
+        with mock.patch.multiple(
+            file_saver_module, ATTACHMENT_CHUNK_SIZE=4, DEDUP_HEAD_SIZE=4
+        ):
+            self.file_saver.save_attachment(Attachment(), folder)
+
+        self.assertEqual(requested, [4, 4, 2])
+        with open(os.path.join(folder, "chunked.bin"), "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_save_attachment_links_duplicates(self):
+        """
+        Test that repeated attachments are hard-linked to the first copy.
+
+        Verifies that:
+        - An identical attachment becomes a hard link to the saved file
+        - An attachment sharing only size and leading bytes is written out
+        """
+
+        class Attachment:
+            name = "report.pdf"
+
+            def __init__(self, data):
+                self.data = data
+                self.size = len(data)
+                self.offset = 0
+
+            def read_buffer(self, size):
+                chunk = self.data[self.offset : self.offset + size]
+                self.offset += len(chunk)
+                return chunk
+
+            def seek_offset(self, offset, whence):
+                self.offset = offset
+
+        folder = self.file_saver._create_full_path("dedup")
+        with mock.patch.object(file_saver_module, "DEDUP_HEAD_SIZE", 4):
+            for data in (b"%PDF same", b"%PDF same", b"%PDF diff"):
+                self.file_saver.save_attachment(Attachment(data), folder)
+
+        paths = [
+            os.path.join(folder, name)
+            for name in ("report.pdf", "report_1.pdf", "report_2.pdf")
+        ]
+        self.assertTrue(os.path.samefile(paths[0], paths[1]))
+        self.assertFalse(os.path.samefile(paths[0], paths[2]))
+        with open(paths[2], "rb") as f:
+            self.assertEqual(f.read(), b"%PDF diff")
+
 
 if __name__ == "__main__":
     unittest.main()
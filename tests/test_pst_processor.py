@@ -2,9 +2,32 @@ import os
 import shutil
 import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from src.pst_processor import PSTProcessor
 
+# Content of every fixture file; the tests only care that the files exist
+_TEST_CONTENT = b"test content"
+
+# PST/OST files test_find_pst_files_with_files expects to find, in sorted order
+_EXPECTED_PST_FILES = ("archive.pst", "test1.pst", "test2.ost")
+
+
+def _touch(path, data=_TEST_CONTENT):
+    """
+    Create a test file with a few bytes of content.
+
+    Args:
+        path (str): Path of the file to create or truncate.
+        data (bytes, optional): Content written to the file.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
 
 class TestPSTProcessor(unittest.TestCase):
     """
@@ -12,29 +35,54 @@ class TestPSTProcessor(unittest.TestCase):
 
     This test suite verifies the functionality of PST/OST file discovery
     and validation operations.
+
+    Each test works only in a directory named after itself, and nothing is
+    written to the class after setUpClass(), so the tests can run in any
+    order or in parallel worker processes (for example pytest -n auto).
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up fixtures shared by all test methods.
+
+        Creates one temporary root directory for the whole class, preferring
+        the /dev/shm tmpfs when it is available.
+        """
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        cls.test_root = tempfile.mkdtemp(dir=shm_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Clean up fixtures shared by all test methods.
+
+        Removes the temporary root directory and all its contents.
+        """
+        shutil.rmtree(cls.test_root, ignore_errors=True)
+
     def setUp(self):
         """
         Set up test fixtures before each test method.
 
-        Creates a temporary directory for testing and initializes a PSTProcessor
-        instance.
+        Creates a temporary directory for the test inside the class root,
+        creates its PST directory and initializes a PSTProcessor instance.
         """
-        # Create a temporary directory for testing
-        self.test_temp_dir = tempfile.mkdtemp()
+        # Each test gets its own directory under the shared root
+        self.test_temp_dir = os.path.join(self.test_root, self._testMethodName)
+        os.mkdir(self.test_temp_dir)
         self.test_pst_dir = os.path.join(self.test_temp_dir, "test_pst_files")
+        os.mkdir(self.test_pst_dir)
         self.processor = PSTProcessor(pst_directory=self.test_pst_dir)
 
     def tearDown(self):
         """
         Clean up test fixtures after each test method.
 
-        Removes the temporary directory and all its contents.
+        Removes the test's temporary directory and all its contents.
         """
         # Clean up the temporary directory after tests
-        if os.path.exists(self.test_temp_dir):
-            shutil.rmtree(self.test_temp_dir)
+        shutil.rmtree(self.test_temp_dir, ignore_errors=True)
 
     def test_find_pst_files_empty_directory(self):
         """
@@ -44,9 +92,10 @@ class TestPSTProcessor(unittest.TestCase):
         - Empty list is returned when no PST/OST files exist
         - Directory is created if it doesn't exist
         """
+        os.rmdir(self.test_pst_dir)
         pst_files = self.processor.find_pst_files()
         self.assertEqual(pst_files, [])
-        self.assertTrue(os.path.exists(self.test_pst_dir))
+        self.assertTrue(os.path.isdir(self.test_pst_dir))
 
     def test_find_pst_files_with_files(self):
         """
@@ -57,9 +106,6 @@ class TestPSTProcessor(unittest.TestCase):
         - Results are sorted alphabetically
         - Non-PST files are ignored
         """
-        # Create test directory and files
-        os.makedirs(self.test_pst_dir, exist_ok=True)
-
         # Create test files
         test_files = [
             "test1.pst",
@@ -69,22 +115,53 @@ class TestPSTProcessor(unittest.TestCase):
             "data.csv",  # Should be ignored
         ]
 
+        prefix = self.test_pst_dir + os.sep
         for filename in test_files:
-            filepath = os.path.join(self.test_pst_dir, filename)
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write("test content")
+            _touch(prefix + filename)
 
         pst_files = self.processor.find_pst_files()
 
         # Should find only PST/OST files, sorted
+        expected_files = [prefix + filename for filename in _EXPECTED_PST_FILES]
+
+        self.assertEqual(pst_files, expected_files)
+
+    def test_find_pst_files_is_case_insensitive(self):
+        """
+        Test that upper-case PST/OST extensions are found.
+
+        Verifies that:
+        - Files like ARCHIVE.PST and Mailbox.Ost are included
+        - Directories named like PST files are ignored
+        """
+        for filename in ["ARCHIVE.PST", "Mailbox.Ost"]:
+            filepath = os.path.join(self.test_pst_dir, filename)
+            _touch(filepath)
+        os.makedirs(os.path.join(self.test_pst_dir, "folder.pst"))
+
+        pst_files = self.processor.find_pst_files()
+
         expected_files = [
-            os.path.join(self.test_pst_dir, "archive.pst"),
-            os.path.join(self.test_pst_dir, "test1.pst"),
-            os.path.join(self.test_pst_dir, "test2.ost"),
+            os.path.join(self.test_pst_dir, "ARCHIVE.PST"),
+            os.path.join(self.test_pst_dir, "Mailbox.Ost"),
         ]
-
         self.assertEqual(pst_files, expected_files)
 
+    def test_find_pst_files_skips_hidden_files(self):
+        """
+        Test that hidden files are not listed.
+
+        Verifies that:
+        - macOS AppleDouble files like ._a.pst are ignored
+        - The PST file next to them is still found
+        """
+        for filename in ["a.pst", "._a.pst", ".hidden.ost"]:
+            _touch(os.path.join(self.test_pst_dir, filename))
+
+        pst_files = self.processor.find_pst_files()
+
+        self.assertEqual(pst_files, [os.path.join(self.test_pst_dir, "a.pst")])
+
     def test_validate_pst_file_valid(self):
         """
         Test validation of valid PST/OST files.
@@ -92,20 +169,18 @@ class TestPSTProcessor(unittest.TestCase):
         Verifies that:
         - Valid PST files return True
         - Valid OST files return True
+        - pathlib.Path arguments are accepted
         """
         # Create test files
-        os.makedirs(self.test_pst_dir, exist_ok=True)
-
         pst_file = os.path.join(self.test_pst_dir, "test.pst")
         ost_file = os.path.join(self.test_pst_dir, "test.ost")
 
-        with open(pst_file, "w", encoding="utf-8") as f:
-            f.write("test content")
-        with open(ost_file, "w", encoding="utf-8") as f:
-            f.write("test content")
+        _touch(pst_file)
+        _touch(ost_file)
 
         self.assertTrue(self.processor.validate_pst_file(pst_file))
         self.assertTrue(self.processor.validate_pst_file(ost_file))
+        self.assertTrue(self.processor.validate_pst_file(Path(pst_file)))
 
     def test_validate_pst_file_invalid(self):
         """
@@ -113,23 +188,21 @@ class TestPSTProcessor(unittest.TestCase):
 
         Verifies that:
         - Non-existent files return False
-        - Files with wrong extensions return False
+        - Files with wrong extensions return False without a stat call
         - Empty/None paths return False
         """
-        # Test non-existent file
-        self.assertFalse(self.processor.validate_pst_file("/non/existent/file.pst"))
-
-        # Test wrong extension
-        os.makedirs(self.test_pst_dir, exist_ok=True)
         txt_file = os.path.join(self.test_pst_dir, "test.txt")
-        with open(txt_file, "w", encoding="utf-8") as f:
-            f.write("test content")
+        _touch(txt_file)
 
-        self.assertFalse(self.processor.validate_pst_file(txt_file))
+        # Non-existent file, wrong extension and empty/None paths
+        for file_path in ["/non/existent/file.pst", txt_file, "", None]:
+            with self.subTest(file_path=file_path):
+                self.assertFalse(self.processor.validate_pst_file(file_path))
 
-        # Test empty/None paths
-        self.assertFalse(self.processor.validate_pst_file(""))
-        self.assertFalse(self.processor.validate_pst_file(None))
+        # Wrong extensions are rejected without touching the filesystem
+        with mock.patch("os.path.exists") as exists:
+            self.assertFalse(self.processor.validate_pst_file("archive.zip"))
+        exists.assert_not_called()
 
     def test_get_pst_files_count(self):
         """
@@ -143,13 +216,9 @@ class TestPSTProcessor(unittest.TestCase):
         self.assertEqual(self.processor.get_pst_files_count(), 0)
 
         # Test with files
-        os.makedirs(self.test_pst_dir, exist_ok=True)
-
-        # Create test PST files
         for i in range(3):
             filepath = os.path.join(self.test_pst_dir, f"test{i}.pst")
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write("test content")
+            _touch(filepath)
 
         self.assertEqual(self.processor.get_pst_files_count(), 3)
 
@@ -163,6 +232,7 @@ class TestPSTProcessor(unittest.TestCase):
         - Returns True if directory already exists
         """
         # Directory shouldn't exist initially
+        os.rmdir(self.test_pst_dir)
         self.assertFalse(os.path.exists(self.test_pst_dir))
 
         # Should create directory and return True